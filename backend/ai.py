@@ -617,7 +617,7 @@ def _build_parashara_lite_payload(chart_data: Any) -> str:
     shadbala_str = ""
     if hasattr(chart_data, 'shadbala') and chart_data.shadbala and chart_data.shadbala.total_shadbala:
         # Normalize keys to lowercase for consistent lookup
-        normalized_shadbala = {k.lower(): v for k, v in chart_data.shadbala.total_shadbala.items()}
+        normalized_shadbala = chart_data.shadbala.normalized
         top_planets = sorted(normalized_shadbala.items(), 
                             key=lambda x: x[1], 
                             reverse=True)[:4]
@@ -667,7 +667,7 @@ def _build_parashara_pro_payload(chart_data: Any, user_query: str = "") -> str:
         # Normalize shadbala dict for consistent lookup
         normalized_shadbala = {}
         if hasattr(chart_data, 'shadbala') and chart_data.shadbala and chart_data.shadbala.total_shadbala:
-            normalized_shadbala = {k.lower(): v for k, v in chart_data.shadbala.total_shadbala.items()}
+            normalized_shadbala = chart_data.shadbala.normalized
         
         for name, data in chart_data.planets.items():
             if name.lower() in relevant_planets:
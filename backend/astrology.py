@@ -9,7 +9,10 @@ from datetime import datetime
 import pytz
 from typing import Dict, Tuple, Optional, List, Union
 from enum import Enum
-from backend.nakshatra_data import get_nakshatra_by_longitude
+from backend.nakshatra_data import (
+    NAKSHATRA_NAMES, NAKSHATRA_LORDS, NAKSHATRA_SYMBOLS, NAKSHATRA_ELEMENTS,
+    get_nakshatras_by_longitudes
+)
 from backend.varga_charts import calculate_all_vargas
 from backend.logger import logger
 from backend.schemas import (
@@ -18,7 +21,7 @@ from backend.schemas import (
 )
 from backend.config import (
     ZODIAC_SIGNS, SIGN_LORDS, NATURAL_RELATIONSHIPS, 
-    KARAKA_LABELS, PLANET_IDS, DEFAULT_AYANAMSA
+    KARAKA_LABELS, PLANET_IDS, DEFAULT_AYANAMSA, sidereal_mode
 )
 from backend.exceptions import (
     AstrologyError, InvalidDateError, InvalidLocationError, 
@@ -139,28 +142,28 @@ def calculate_planetary_positions(jd: float) -> Dict:
         EphemerisCalculationError: If swisseph fails
     """
     try:
-        swe.set_sid_mode(DEFAULT_AYANAMSA)
         chart_data = {}
         
         logger.info("Calculating planetary positions...")
         
-        for planet_name, planet_id in PLANET_IDS.items():
-            try:
-                result = swe.calc_ut(jd, planet_id, swe.FLG_SIDEREAL)
-                longitude = result[0][0]
+        with sidereal_mode(DEFAULT_AYANAMSA):
+            for planet_name, planet_id in PLANET_IDS.items():
+                try:
+                    result = swe.calc_ut(jd, planet_id, swe.FLG_SIDEREAL)
+                    longitude = result[0][0]
                 
-                sign, degree, sign_num = get_zodiac_sign(longitude)
+                    sign, degree, sign_num = get_zodiac_sign(longitude)
                 
-                chart_data[planet_name] = {
-                    'name': planet_name.capitalize(),
-                    'sign': sign,
-                    'degree': round(degree, 2),
-                    'sign_num': sign_num,
-                    'abs_pos': round(longitude, 2)
-                }
-            except swe.Error as e:
-                logger.error(f"Error calculating {planet_name}: {e}")
-                raise EphemerisCalculationError(f"Failed to calculate position for {planet_name}: {e}")
+                    chart_data[planet_name] = {
+                        'name': planet_name.capitalize(),
+                        'sign': sign,
+                        'degree': round(degree, 2),
+                        'sign_num': sign_num,
+                        'abs_pos': round(longitude, 2)
+                    }
+                except swe.Error as e:
+                    logger.error(f"Error calculating {planet_name}: {e}")
+                    raise EphemerisCalculationError(f"Failed to calculate position for {planet_name}: {e}")
         
         # Calculate Ketu (180° opposite to Rahu)
         rahu_pos = chart_data['rahu']['abs_pos']
@@ -194,15 +197,14 @@ def calculate_ascendant(jd: float, lat: float, lon: float) -> Dict:
         Dictionary with ascendant data
     """
     try:
-        swe.set_sid_mode(DEFAULT_AYANAMSA)
-        
         # Get houses (we only need ascendant)
         # Handle potential error if lat/lon is invalid for swisseph
         houses = swe.houses(jd, lat, lon, b'P')
         asc_tropical = houses[0][0]
         
         # Convert to sidereal
-        ayanamsa = swe.get_ayanamsa_ut(jd)
+        with sidereal_mode(DEFAULT_AYANAMSA):
+            ayanamsa = swe.get_ayanamsa_ut(jd)
         asc_sidereal = (asc_tropical - ayanamsa) % 360
         
         sign, degree, sign_num = get_zodiac_sign(asc_sidereal)
@@ -287,6 +289,10 @@ def get_house_lords_ruled(planet_name: str, asc_sign_num: int) -> str:
     return ", ".join(houses_ruled) if houses_ruled else "-"
 
 
+# Houses 2, 3, 4, 10, 11, 12 from a planet (as sign distances) are temporal friends
+TEMPORAL_FRIEND_HOUSES = frozenset({1, 2, 3, 9, 10, 11})
+
+
 def calculate_compound_relationship(planet_name: str, sign_num: int, 
                                    chart_data: Dict) -> str:
     """
@@ -329,9 +335,8 @@ def calculate_compound_relationship(planet_name: str, sign_num: int,
     if lord_sign == -1:
         return "Neutral"
     
-    # Houses 2, 3, 4, 10, 11, 12 from a planet are friendly
     house_diff = (sign_num - lord_sign) % 12
-    temporal_score = 1 if house_diff in [1, 2, 3, 9, 10, 11] else -1
+    temporal_score = 1 if house_diff in TEMPORAL_FRIEND_HOUSES else -1
     
     # Compound score
     total = natural_score + temporal_score
@@ -378,6 +383,20 @@ def generate_vedic_chart(name: str, year: int, month: int, day: int,
         # 5. Calculate Chara Karakas
         karaka_map = calculate_chara_karakas(chart_data)
         
+        # Nakshatra/pada for every planet in one vectorized pass
+        nak_planets = [
+            name for name, data in chart_data.items()
+            if name != '_metadata' and isinstance(data, dict) and 'abs_pos' in data
+        ]
+        try:
+            nak_nums, padas = get_nakshatras_by_longitudes(
+                [chart_data[name]['abs_pos'] for name in nak_planets]
+            )
+            nakshatra_of = dict(zip(nak_planets, zip(nak_nums.tolist(), padas.tolist())))
+        except Exception as e:
+            logger.warning(f"Failed to calculate nakshatras: {e}")
+            nakshatra_of = {}
+        
         # 6. Enhance each planet with additional data
         for planet_name, planet_data in chart_data.items():
             if planet_name == '_metadata':
@@ -403,13 +422,13 @@ def generate_vedic_chart(name: str, year: int, month: int, day: int,
             
             # Add Nakshatra
             try:
-                nak_dict, pada = get_nakshatra_by_longitude(planet_data['abs_pos'])
+                nak_num, pada = nakshatra_of[planet_name]
                 planet_data['nakshatra'] = {
-                    'nakshatra': nak_dict['name'],
-                    'lord': nak_dict['lord'],
+                    'nakshatra': NAKSHATRA_NAMES[nak_num],
+                    'lord': NAKSHATRA_LORDS[nak_num],
                     'pada': pada,
-                    'symbol': nak_dict['symbol'],
-                    'element': nak_dict['element']
+                    'symbol': NAKSHATRA_SYMBOLS[nak_num],
+                    'element': NAKSHATRA_ELEMENTS[nak_num]
                 }
             except Exception as e:
                 logger.warning(f"Failed to calculate nakshatra for {planet_name}: {e}")
@@ -433,13 +452,15 @@ def generate_vedic_chart(name: str, year: int, month: int, day: int,
             # Don't fail entire chart for vargas
         
         # 8. Add metadata
+        with sidereal_mode(DEFAULT_AYANAMSA):
+            ayanamsa = swe.get_ayanamsa_ut(jd)
         metadata = ChartMetadata(
             name=name,
             datetime=f"{year}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}",
             location=city,
             latitude=lat,
             longitude=lon,
-            ayanamsa=round(swe.get_ayanamsa_ut(jd), 2),
+            ayanamsa=round(ayanamsa, 2),
             zodiac_system='Sidereal (Lahiri)',
             house_system='Whole Sign',
             gender='Unknown' # Default
@@ -456,7 +477,9 @@ def generate_vedic_chart(name: str, year: int, month: int, day: int,
             
             planets_dict[p_name] = PlanetPosition(**p_data)
             
-        response = ChartResponse(
+        # Every part is already a validated model keyed by known planet names,
+        # so skip re-walking the planet and varga dicts
+        response = ChartResponse.model_construct(
             planets=planets_dict,
             metadata=metadata,
             vargas=varga_data
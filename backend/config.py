@@ -1,10 +1,14 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
 import swisseph as swe
 
 # Zodiac Signs
-ZODIAC_SIGNS = [
+ZODIAC_SIGNS = (
     "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
     "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-]
+)
 
 # Sign lords for Vedic astrology
 SIGN_LORDS = {
@@ -53,6 +57,25 @@ PLANET_IDS = {
 # Calculation Settings
 DEFAULT_AYANAMSA = swe.SIDM_LAHIRI
 KP_AYANAMSA = swe.SIDM_KRISHNAMURTI
+
+# Sidereal mode is process-global Swiss Ephemeris state shared by the Lahiri
+# (chart) and KP paths, which run in worker threads. Every mode-dependent swe
+# call goes inside `with sidereal_mode(...)`: the lock stops another thread
+# switching modes mid-block, and set_sid_mode is only called on a change.
+# The tracker assumes nothing else calls swe.set_sid_mode directly.
+_sid_mode_lock = threading.RLock()
+_active_sid_mode = None
+
+@contextmanager
+def sidereal_mode(mode: int) -> Iterator[None]:
+    """Hold the Swiss Ephemeris sidereal mode at `mode` for the block."""
+    global _active_sid_mode
+    with _sid_mode_lock:
+        if _active_sid_mode != mode:
+            swe.set_sid_mode(mode)
+            _active_sid_mode = mode
+        yield
+
 DEFAULT_HOUSE_SYSTEM = b'P' # Placidus (though we use Whole Sign for chart display, P is often default houses calc in swisseph)
 # Actually the code uses Whole Sign manually calculated from Ascendant degree.
 # But for `swe.houses` call in `astrology.py`: `houses = swe.houses(jd, lat, lon, b'P')`
@@ -1,7 +1,12 @@
 
-from typing import Dict, List, Optional, Any
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+import json
+from itertools import accumulate
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Any
+import numpy as np
 import swisseph as swe
-from datetime import datetime, timedelta
 # Pydantic models imported from schemas
 from backend.schemas import DashaPeriod, CompleteDashaInfo, CurrentDashaState
 from backend.logger import logger
@@ -24,8 +29,120 @@ DASHA_PERIODS = {
 }
 
 PLANET_SEQUENCE = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
+LORD_TO_IDX = {name: i for i, name in enumerate(PLANET_SEQUENCE)}
+PERIOD_ARR = tuple(DASHA_PERIODS[name] for name in PLANET_SEQUENCE)
+# ROTATED_IDX[start][i] == (start + i) % 9: lord order beginning at `start`
+ROTATED_IDX = tuple(tuple((start + i) % 9 for i in range(9)) for start in range(9))
+# Cumulative boundaries (years) of the 9 sub-periods, per starting lord
+CUM_PERIODS_FROM = tuple(
+    tuple(accumulate(PERIOD_ARR[idx] for idx in row)) for row in ROTATED_IDX
+)
+# Years elapsed in the 120-year cycle (from Ketu) before each lord's Maha Dasha
+CUM_DASHA = (0,) + CUM_PERIODS_FROM[0]
 TOTAL_DASHA_YEARS = 120
 DAYS_PER_YEAR = 365.25 # Julian Year average for simplicity in Dasha
+PERIOD_DAYS = tuple(years * DAYS_PER_YEAR for years in PERIOD_ARR)
+# Sub-period spans and boundaries as fractions of their parent period
+PERIOD_FRACTIONS = tuple(p / TOTAL_DASHA_YEARS for p in PERIOD_ARR)
+CUM_FRACTIONS_FROM = tuple(
+    tuple(b / TOTAL_DASHA_YEARS for b in row) for row in CUM_PERIODS_FROM
+)
+
+class DashaLevel(NamedTuple):
+    """Lord and remaining balance (years) of one active dasha level."""
+    lord: str
+    balance: float
+
+
+class DrillDown(NamedTuple):
+    """Active periods at a moment, Maha (level 1) through Prana (level 5)."""
+    maha: Optional[DashaLevel] = None
+    antar: Optional[DashaLevel] = None
+    pratyantar: Optional[DashaLevel] = None
+    sookshma: Optional[DashaLevel] = None
+    prana: Optional[DashaLevel] = None
+
+
+@dataclass
+class TimelineArrays:
+    """
+    Flat struct-of-arrays form of a dasha timeline.
+    Rows are in depth-first order (every parent precedes its sub-periods);
+    parent_idx is the row of the enclosing period, -1 for Maha Dashas.
+    """
+    lord_idx: np.ndarray    # int8, PLANET_SEQUENCE position
+    level: np.ndarray       # int8, 1=Maha ... 5=Prana
+    start_jd: np.ndarray    # float64
+    end_jd: np.ndarray      # float64
+    parent_idx: np.ndarray  # int32
+
+    def __len__(self) -> int:
+        return len(self.lord_idx)
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield one plain dict per period, scanning the columns once."""
+        for lord_i, level, start_jd, end_jd, parent in zip(
+            self.lord_idx.tolist(), self.level.tolist(), self.start_jd.tolist(),
+            self.end_jd.tolist(), self.parent_idx.tolist()
+        ):
+            yield {
+                'lord': PLANET_SEQUENCE[lord_i],
+                'level': level,
+                'start_jd': start_jd,
+                'end_jd': end_jd,
+                'parent': parent
+            }
+
+    def to_json(self) -> str:
+        """Serialize the flat rows without going through Pydantic."""
+        return json.dumps(list(self.rows()), separators=(',', ':'))
+
+
+# Field-name tuple -> fields-set shared by every DashaPeriod of that shape.
+# DashaPeriod is frozen, so the set is never mutated through a node.
+_SHARED_FIELDS_SETS: Dict[Tuple[str, ...], Set[str]] = {}
+
+
+def _with_current_tags(node: Dict[str, Any], current_jd: float) -> Dict[str, Any]:
+    """
+    Copy of node with its active sub-period chain tagged is_current.
+    node itself is never modified (it may be a memoized timeline node).
+    """
+    if not node['start_jd'] <= current_jd < node['end_jd']:
+        return node
+    tagged = dict(node, is_current=True)
+    subs = node.get('sub_periods')
+    if subs:
+        for i, sub in enumerate(subs):
+            if sub['start_jd'] <= current_jd < sub['end_jd']:
+                tagged['sub_periods'] = subs[:i] + [_with_current_tags(sub, current_jd)] + subs[i + 1:]
+                break
+    return tagged
+
+
+def _period_from_node(node: Dict[str, Any]) -> DashaPeriod:
+    """
+    Build a DashaPeriod from a trusted timeline node via model_construct.
+    The timeline is generated internally, so per-node validation is skipped.
+    """
+    fields = {
+        'lord': node['lord'],
+        'level': node['level'],
+        'start_jd': float(node['start_jd']),
+        'end_jd': float(node['end_jd']),
+    }
+    if 'duration_years' in node:
+        fields['duration_years'] = float(node['duration_years'])
+    if 'sub_periods' in node:
+        fields['sub_periods'] = [_period_from_node(sub) for sub in node['sub_periods']]
+    if 'is_current' in node:
+        fields['is_current'] = node['is_current']
+    shape = tuple(fields)
+    fields_set = _SHARED_FIELDS_SETS.get(shape)
+    if fields_set is None:
+        fields_set = _SHARED_FIELDS_SETS[shape] = set(shape)
+    return DashaPeriod.model_construct(fields_set, **fields)
+
 
 class VimshottariDashaSystem:
     """
@@ -36,17 +153,6 @@ class VimshottariDashaSystem:
     def __init__(self):
         self.nakshatra_span = 360.0 / 27.0
         
-    def _jd_to_date(self, jd: float) -> str:
-        """Convert Julian Day to ISO Format Date String"""
-        try:
-            # swe.revjul returns (year, month, day, hour)
-            y, m, d, h = swe.revjul(jd)
-            # Adjust for float hours
-            dt = datetime(y, m, d) + timedelta(hours=h)
-            return dt.isoformat()
-        except:
-            return str(jd)
-
     def get_nakshatra_info(self, moon_lon: float):
         """Get nakshatra num (0-26), lord, and degree traversal"""
         # Normalize
@@ -82,12 +188,52 @@ class VimshottariDashaSystem:
         Generate Dasha timeline starting from birth.
         max_level: 1=Maha, 2=Antar, 3=Pratyantar...
         """
-        timeline = []
-        
+        # Preallocate: at most the partial birth period plus one Maha per
+        # shortest (6-year) period that fits in years_duration
+        timeline = [None] * (int(years_duration // min(PERIOD_ARR)) + 2)
+        n = 0
+        for maha in self._walk_dasha(moon_lon, birth_jd, years_duration, max_level):
+            timeline[n] = maha
+            n += 1
+            
+        del timeline[n:]
+        return timeline
+
+    def generate_timeline_arrays(self, moon_lon: float, birth_jd: float,
+                                 years_duration: int = 120, max_level: int = 3) -> TimelineArrays:
+        """Same periods as generate_timeline, flattened into a TimelineArrays."""
+        lord_idx, levels, starts, ends, parents = [], [], [], [], []
+        
+        for maha in self._walk_dasha(moon_lon, birth_jd, years_duration, max_level):
+            # Explicit pre-order stack of (node, parent row)
+            stack = [(maha, -1)]
+            while stack:
+                node, parent = stack.pop()
+                row = len(lord_idx)
+                lord_idx.append(LORD_TO_IDX[node['lord']])
+                levels.append(node['level'])
+                starts.append(node['start_jd'])
+                ends.append(node['end_jd'])
+                parents.append(parent)
+                stack.extend((sub, row) for sub in reversed(node.get('sub_periods', ())))
+                
+        return TimelineArrays(
+            lord_idx=np.array(lord_idx, dtype=np.int8),
+            level=np.array(levels, dtype=np.int8),
+            start_jd=np.array(starts, dtype=np.float64),
+            end_jd=np.array(ends, dtype=np.float64),
+            parent_idx=np.array(parents, dtype=np.int32)
+        )
+
+    def _walk_dasha(self, moon_lon: float, birth_jd: float, years_duration: int = 120,
+                    max_level: int = 3) -> Iterator[Dict]:
+        """
+        Stream Maha Dasha nodes (with sub-periods down to max_level) from birth.
+        """
         # 1. Start with Birth Dasha
         balance = self.calculate_birth_balance(moon_lon)
         start_lord = balance['lord']
-        start_idx = PLANET_SEQUENCE.index(start_lord)
+        start_idx = LORD_TO_IDX[start_lord]
         
         curr_jd = birth_jd
         
@@ -127,23 +273,23 @@ class VimshottariDashaSystem:
             # The duration of sub_periods must sum to duration_years?
             # My _generate_sub_periods handles start_fraction logic.
 
-        timeline.append(first_maha)
+        yield first_maha
         curr_jd = end_jd
         
         # 2. Subsequent Maha Dashas
         # Cycle through sequence until 120 years covered
         years_covered = balance['balance_years']
         
-        idx = (start_idx + 1) % 9
+        idx = ROTATED_IDX[start_idx][1]
         
         while years_covered < years_duration:
             lord = PLANET_SEQUENCE[idx]
-            duration = DASHA_PERIODS[lord]
+            duration = PERIOD_ARR[idx]
             
             # If expanding exceeds limit, truncate?
             # Usually we just list full periods
             
-            p_end_jd = curr_jd + (duration * DAYS_PER_YEAR)
+            p_end_jd = curr_jd + PERIOD_DAYS[idx]
             
             maha = {
                 'lord': lord,
@@ -159,13 +305,11 @@ class VimshottariDashaSystem:
                     lord, duration, curr_jd, max_level, current_level=2
                 )
                 
-            timeline.append(maha)
+            yield maha
             
             curr_jd = p_end_jd
             years_covered += duration
-            idx = (idx + 1) % 9
-            
-        return timeline
+            idx = ROTATED_IDX[idx][1]
 
     def _generate_sub_periods(self, parent_lord: str, parent_years: float, 
                               start_jd: float, max_level: int, current_level: int,
@@ -174,8 +318,10 @@ class VimshottariDashaSystem:
         Recursive generation.
         start_fraction: If > 0, we skip/truncate initial sub-periods (Birth case).
         """
-        subs = []
-        parent_idx = PLANET_SEQUENCE.index(parent_lord)
+        # Exactly 9 candidates; birth-partial case fills fewer
+        subs = [None] * 9
+        n = 0
+        parent_idx = LORD_TO_IDX[parent_lord]
         
         # Sub-period sequence always starts with Parent Lord
         
@@ -193,10 +339,10 @@ class VimshottariDashaSystem:
         
         accumulated_days = 0.0
         
-        for i in range(9):
-            # Lord Sequence: Starts at Parent Lord
-            lord = PLANET_SEQUENCE[(parent_idx + i) % 9]
-            lord_years = DASHA_PERIODS[lord]
+        # Lord Sequence: Starts at Parent Lord
+        for lord_idx in ROTATED_IDX[parent_idx]:
+            lord = PLANET_SEQUENCE[lord_idx]
+            lord_years = PERIOD_ARR[lord_idx]
             
             sub_duration_years = (parent_years * lord_years) / 120.0
             sub_duration_days = sub_duration_years * DAYS_PER_YEAR
@@ -234,7 +380,8 @@ class VimshottariDashaSystem:
                         current_level + 1, start_fraction=fraction_into_period
                     )
                 
-                subs.append(sub_entry)
+                subs[n] = sub_entry
+                n += 1
                 curr_jd += real_duration
                 accumulated_days += sub_duration_days
                 continue
@@ -252,14 +399,16 @@ class VimshottariDashaSystem:
                     lord, sub_duration_years, curr_jd, max_level, current_level + 1
                  )
             
-            subs.append(sub_entry)
+            subs[n] = sub_entry
+            n += 1
             curr_jd += sub_duration_days
             accumulated_days += sub_duration_days
             
+        del subs[n:]
         return subs
 
     def get_current_dasha_detailed(self, moon_lon: float, birth_jd: float, 
-                                   target_jd: float) -> Dict[str, Any]:
+                                   target_jd: float) -> DrillDown:
         """Find the exact leaf node period for a target date."""
         # TODO: Optimize instead of generating full timeline
         # For now, generate full timeline (cached?)
@@ -279,13 +428,10 @@ class VimshottariDashaSystem:
         # Sequence starts at Ketu.
         # Find PRECEEDING years before Current Nakshatra Lord.
         
-        lord_idx = PLANET_SEQUENCE.index(lord)
-        years_preceding = 0.0
-        for i in range(lord_idx):
-            years_preceding += DASHA_PERIODS[PLANET_SEQUENCE[i]]
-            
-        # Add fraction of current lord
-        years_preceding += (DASHA_PERIODS[lord] * fraction_traversed)
+        lord_idx = LORD_TO_IDX[lord]
+        
+        # Preceding full periods + fraction of current lord
+        years_preceding = CUM_DASHA[lord_idx] + (PERIOD_ARR[lord_idx] * fraction_traversed)
         
         # Total years from "Cycle Start" (0 Aries Ketu start point equivalent)
         elapsed_since_birth_days = target_jd - birth_jd
@@ -304,97 +450,107 @@ class VimshottariDashaSystem:
                                   current_jd: float) -> CompleteDashaInfo:
         """
         Main entry point for Enhanced Dasha System.
+        
+        The birth timeline depends only on (moon_lon, birth_jd), so it is
+        memoized on those inputs quantized to 1e-6. The current state and the
+        is_current tags are computed for the exact current_jd on every call,
+        and each call returns new models.
+        """
+        moon_lon_q, birth_jd_q = round(moon_lon * 1e6), round(birth_jd * 1e6)
+        return self._build_complete_dasha(
+            moon_lon_q / 1e6, birth_jd_q / 1e6, current_jd,
+            _timeline_nodes_cached(moon_lon_q, birth_jd_q)
+        )
+
+    def _build_complete_dasha(self, moon_lon: float, birth_jd: float, current_jd: float,
+                              timeline_nodes: Optional[Tuple[Dict, ...]] = None) -> CompleteDashaInfo:
+        """
+        Body of calculate_complete_dasha. timeline_nodes are the untagged
+        Maha/Antar nodes for (moon_lon, birth_jd); walked here when not given.
         """
         # 1. Get detailed current state (up to Prana)
-        detailed_map = self.get_current_dasha_detailed(moon_lon, birth_jd, current_jd)
-        
-        # Convert map to CurrentDashaState
-        # Maps keys 'maha', 'antar' etc to DashaPeriod objects
-        # We need to construct DashaPeriod. We only have 'lord' and 'balance'.
-        # We need start_jd, end_jd?
-        # Drill down logic returns balance.
-        # We should enhance drill_down to return full DashaPeriod objects?
-        # Or Just minimal info for now. Schema allows defaults.
-        
-        # Helper to make dummy/minimal period
-        def make_period(p_data: Dict, level: int):
-            if not p_data: return None
-            # Estimate start/end based on current_jd ??
-            # Balance means time REMAINING.
-            # End = Current + Balance.
-            # Start = End - TotalDuration?
-            # We don't have TotalDuration in simple map.
-            # We can lookup standard duration relative to level.
-            # But calculating exact start needs parent context.
-            # For UI Display: "Balance: X Years" is critical.
-            return DashaPeriod(
-                lord=p_data['lord'],
+        detailed = self.get_current_dasha_detailed(moon_lon, birth_jd, current_jd)
+        
+        # Convert DrillDown levels to CurrentDashaState
+        # We only have 'lord' and 'balance' per level.
+        # For UI Display: "Balance: X Years" is critical.
+        def make_period(level_data: Optional[DashaLevel], level: int):
+            if level_data is None: return None
+            lord, balance = level_data
+            # Balance means time REMAINING: End = Current + Balance.
+            # Exact start needs parent context, so current_jd is a placeholder.
+            return DashaPeriod.model_construct(
+                lord=lord,
                 level=level,
                 start_jd=current_jd, # Approx/Placeholder
-                end_jd=current_jd + (p_data['balance'] * DAYS_PER_YEAR),
-                duration_years=p_data['balance'], # Shows Remaining
+                end_jd=current_jd + (balance * DAYS_PER_YEAR),
+                duration_years=balance, # Shows Remaining
                 is_current=True
             )
             
-        current_state = CurrentDashaState(
-            maha_dasha=make_period(detailed_map.get('maha'), 1),
-            antar_dasha=make_period(detailed_map.get('antar'), 2),
-            pratyantar_dasha=make_period(detailed_map.get('pratyantar'), 3),
-            sookshma_dasha=make_period(detailed_map.get('sookshma'), 4),
-            prana_dasha=make_period(detailed_map.get('prana'), 5)
+        maha, antar, pratyantar, sookshma, prana = (
+            make_period(level_data, level) for level, level_data in enumerate(detailed, start=1)
+        )
+        current_state = CurrentDashaState.model_construct(
+            maha_dasha=maha,
+            antar_dasha=antar,
+            pratyantar_dasha=pratyantar,
+            sookshma_dasha=sookshma,
+            prana_dasha=prana
         )
         
-        # 2. Complete Timeline (Cached or Generated)
-        raw_timeline = self.generate_timeline(moon_lon, birth_jd, max_level=2)
-        # Pydantic will parse list of dicts
+        # 2. Complete Timeline: tag the active Maha/Antar on copies of the nodes.
+        # Trusted internal data: construct models directly instead of validating each node
+        if timeline_nodes is None:
+            timeline_nodes = self._walk_dasha(moon_lon, birth_jd, max_level=2)
+        timeline = [
+            _period_from_node(_with_current_tags(node, current_jd))
+            for node in timeline_nodes
+        ]
         
-        return CompleteDashaInfo(
+        return CompleteDashaInfo.model_construct(
             current_state=current_state,
-            timeline=raw_timeline
+            timeline=timeline
         )
 
-    def _drill_down_dasha(self, year_offset: float) -> Dict[str, Any]:
+    def _drill_down_dasha(self, year_offset: float) -> DrillDown:
         """
         Drill down 5 levels for a given year offset (0-120).
+        Sweeps in fraction-of-parent space: each level is one binary search
+        over CUM_FRACTIONS_FROM plus a rescale, with no per-candidate loop.
         """
-        result = {}
-        lv_names = ['maha', 'antar', 'pratyantar', 'sookshma', 'prana']
-        
-        # Level 1: Maha
-        parent_lord = ''
-        parent_years = 0.0
-        rem_years = year_offset
-        
-        for lord in PLANET_SEQUENCE:
-            dur = DASHA_PERIODS[lord]
-            if rem_years < dur:
-                parent_lord = lord
-                parent_years = dur
-                result['maha'] = {'lord': lord, 'balance': dur - rem_years}
-                break
-            rem_years -= dur
-            
-        current_p_lord = parent_lord
-        current_p_dur = parent_years
-        current_rem = rem_years
+        levels = []
         
-        for level in range(1, 5): # Levels 2,3,4,5 (Antar to Prana)
-            found_sub = False
-            start_idx = PLANET_SEQUENCE.index(current_p_lord)
-            
-            for i in range(9):
-                sub_lord = PLANET_SEQUENCE[(start_idx + i) % 9]
-                sub_years = (current_p_dur * DASHA_PERIODS[sub_lord]) / 120.0
-                
-                if current_rem < sub_years:
-                     result[lv_names[level]] = {'lord': sub_lord, 'balance': sub_years - current_rem}
-                     current_p_lord = sub_lord
-                     current_p_dur = sub_years
-                     found_sub = True
-                     break
-                current_rem -= sub_years
-                
-            if not found_sub:
+        # Level 1's parent is the full 120-year cycle starting at Ketu
+        start_idx = 0
+        parent_years = float(TOTAL_DASHA_YEARS)
+        frac = year_offset / TOTAL_DASHA_YEARS
+        
+        for _ in range(5):
+            bounds = CUM_FRACTIONS_FROM[start_idx]
+            i = bisect_right(bounds, frac)
+            if i >= 9:
                 break
                 
-        return result
+            lord_idx = ROTATED_IDX[start_idx][i]
+            share = PERIOD_FRACTIONS[lord_idx]
+            # Position within the selected sub-period, as a fraction of it
+            frac = (frac - (bounds[i - 1] if i else 0.0)) / share
+            sub_years = parent_years * share
+            levels.append(DashaLevel(PLANET_SEQUENCE[lord_idx], sub_years * (1.0 - frac)))
+            
+            start_idx = lord_idx
+            parent_years = sub_years
+                
+        return DrillDown(*levels)
+
+
+@lru_cache(maxsize=2048)
+def _timeline_nodes_cached(moon_lon_q: int, birth_jd_q: int) -> Tuple[Dict, ...]:
+    """
+    Untagged Maha/Antar timeline nodes keyed on quantized inputs (see
+    calculate_complete_dasha). Shared between calls: never mutated or returned.
+    """
+    return tuple(VimshottariDashaSystem()._walk_dasha(
+        moon_lon_q / 1e6, birth_jd_q / 1e6, max_level=2
+    ))
@@ -3,11 +3,14 @@ KP (Krishnamurti Paddhati) Astrology Calculations - Expert Edition
 Implements house cusps (Placidus), robust sub-lords, and Dasha calculations
 """
 
+import numpy as np
 import swisseph as swe
 from typing import Dict, List, Tuple, Optional, Any
+from bisect import bisect_right
 from functools import lru_cache
+from itertools import accumulate, chain
 from backend.logger import logger
-from backend.config import DEFAULT_AYANAMSA, KP_AYANAMSA
+from backend.config import KP_AYANAMSA, sidereal_mode
 
 # ============================================================================
 # CONSTANTS
@@ -33,14 +36,39 @@ DAYS_PER_YEAR = 365.25
 
 PLANET_SEQUENCE = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
 
+# O(1) lord -> sequence position (avoids PLANET_SEQUENCE.index scans in hot loops)
+LORD_TO_IDX = {name: i for i, name in enumerate(PLANET_SEQUENCE)}
+PERIOD_ARR = tuple(DASHA_PERIODS[name] for name in PLANET_SEQUENCE)
+PERIOD_DAYS = tuple(years * DAYS_PER_YEAR for years in PERIOD_ARR)
+
+# ROTATED_IDX[start][i] == (start + i) % 9: lord order beginning at `start`
+ROTATED_IDX = tuple(tuple((start + i) % 9 for i in range(9)) for start in range(9))
+ROTATED_IDX_NP = np.array(ROTATED_IDX, dtype=np.int64)
+
+# Cumulative sub-period boundaries (years) of the 9 subs, per starting star lord
+CUM_PERIODS_FROM = tuple(
+    tuple(accumulate(PERIOD_ARR[idx] for idx in row)) for row in ROTATED_IDX
+)
+CUM_PERIODS_NP = np.array(CUM_PERIODS_FROM, dtype=np.float64)
+# Same boundaries in days, for locating the running Maha Dasha
+CUM_DAYS_FROM = tuple(
+    tuple(accumulate(PERIOD_DAYS[idx] for idx in row)) for row in ROTATED_IDX
+)
+
+# calculate_sub_lord cache key resolution: 1e-6 deg (~0.004 arc-second)
+SUB_LORD_KEY_SCALE = 1e6
+
+# Planet names (capitalized) that receive KP star/sub lords
+KP_ACCEPTED_NAMES = frozenset(PLANET_SEQUENCE) | {'Ascendant'}
+
 NAKSHATRA_LORDS = [
     'Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury'
 ] * 3
 
-ZODIAC_SIGNS = [
+ZODIAC_SIGNS = (
     'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
     'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-]
+)
 
 # ============================================================================
 # VALIDATION & HELPERS
@@ -73,23 +101,46 @@ def get_nakshatra_info(longitude: float) -> Tuple[int, str, float]:
     return nak_num, NAKSHATRA_LORDS[nak_num], degree_in_nak
 
 
+def kp_batch(lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized star-lord / sub-lord lookup for many longitudes at once.
+    Returns (star_idx, sub_idx) arrays of PLANET_SEQUENCE positions, matching
+    get_nakshatra_info / calculate_sub_lord element-wise.
+    """
+    lons = np.mod(np.asarray(lons, dtype=np.float64), DEGREES_PER_ZODIAC)
+    lons[(lons < 1e-12) | (np.abs(lons - DEGREES_PER_ZODIAC) < 1e-12)] = 0.0
+    
+    nak_num = (lons / NAKSHATRA_SPAN_DEGREES).astype(np.int64) % NAKSHATRA_COUNT
+    star_idx = nak_num % 9
+    projected_years = (np.mod(lons, NAKSHATRA_SPAN_DEGREES) / NAKSHATRA_SPAN_DEGREES) * TOTAL_DASHA_YEARS
+    
+    # Row-wise searchsorted: count boundaries at or below each offset
+    passed = (CUM_PERIODS_NP[star_idx] <= (projected_years - 1e-12)[:, None]).sum(axis=1)
+    sub_idx = ROTATED_IDX_NP[star_idx, np.minimum(passed, 8)]
+    return star_idx, sub_idx
+
+
 # ============================================================================
 # KP CORE CALCULATIONS
 # ============================================================================
 
+@lru_cache(maxsize=1024)
+def _ayanamsa(jd: float, sid_mode: int = KP_AYANAMSA) -> float:
+    """Cached ayanamsa for a Julian Day (keyed on sidereal mode as well)."""
+    with sidereal_mode(sid_mode):
+        return swe.get_ayanamsa_ut(jd)
+
+
 @lru_cache(maxsize=256)
 def calculate_placidus_cusps(jd: float, lat: float, lon: float) -> Dict[int, Dict[str, Any]]:
     """Calculate 12 house cusps using Placidus system with KP Ayanamsa."""
     validate_astro_inputs(jd, lat, lon)
     
     try:
-        # Enforce KP Ayanamsa
-        swe.set_sid_mode(KP_AYANAMSA)
-        
-        # houses() returns (cusps, ascmc)
+        # houses() returns tropical (cusps, ascmc); KP Ayanamsa applied below
         houses_tropical, _ = swe.houses(jd, lat, lon, b'P')
         
-        ayanamsa = swe.get_ayanamsa_ut(jd)
+        ayanamsa = _ayanamsa(jd, KP_AYANAMSA)
         cusps = {}
         
         for i in range(12):
@@ -109,13 +160,35 @@ def calculate_placidus_cusps(jd: float, lat: float, lon: float) -> Dict[int, Dic
         raise RuntimeError(f"Failed to calculate house cusps: {e}")
 
 
-@lru_cache(maxsize=512)
+def _sub_lord_idx(star_idx: int, projected_years: float) -> int:
+    """
+    Numeric sub-lord kernel: ints/floats in, PLANET_SEQUENCE index out.
+    Single binary search over the precomputed cumulative boundaries.
+    """
+    # First boundary strictly above the offset (epsilon included for safety)
+    i = bisect_right(CUM_PERIODS_FROM[star_idx], projected_years - 1e-12)
+    return ROTATED_IDX[star_idx][min(i, 8)]
+
+
 def calculate_sub_lord(longitude: float) -> str:
     """
     Calculate sub-lord for a given degree using robust fraction-based logic.
     Prevents floating-point drift accumulation.
     """
-    _, star_lord, degree_in_nak = get_nakshatra_info(longitude)
+    # Cache on a quantized key so float jitter between charts still hits
+    return _sub_lord_q(round(longitude * SUB_LORD_KEY_SCALE))
+
+
+def calculate_sub_lords_batch(longitudes: np.ndarray) -> List[str]:
+    """Sub-lords for many longitudes in a single kp_batch call."""
+    _, sub_idx = kp_batch(longitudes)
+    return [PLANET_SEQUENCE[i] for i in sub_idx.tolist()]
+
+
+@lru_cache(maxsize=8192)
+def _sub_lord_q(lon_q: int) -> str:
+    """Cached body of calculate_sub_lord, keyed on longitude in micro-degrees."""
+    nak_num, _, degree_in_nak = get_nakshatra_info(lon_q / SUB_LORD_KEY_SCALE)
     
     # Calculate fraction of Nakshatra traversed (0.0 to 1.0)
     fraction_traversed = degree_in_nak / NAKSHATRA_SPAN_DEGREES
@@ -123,18 +196,8 @@ def calculate_sub_lord(longitude: float) -> str:
     # Map fraction to "Projected Years" in the 120-year cycle
     projected_years = fraction_traversed * TOTAL_DASHA_YEARS
     
-    start_index = PLANET_SEQUENCE.index(star_lord)
-    cumulative_years = 0.0
-    
-    for i in range(9):
-        lord = PLANET_SEQUENCE[(start_index + i) % 9]
-        period = DASHA_PERIODS[lord]
-        
-        if projected_years < (cumulative_years + period + 1e-12): # Include epsilon for safety
-            return lord
-        cumulative_years += period
-    
-    return PLANET_SEQUENCE[(start_index + 8) % 9]
+    # Star lord index: NAKSHATRA_LORDS repeats PLANET_SEQUENCE every 9 nakshatras
+    return PLANET_SEQUENCE[_sub_lord_idx(nak_num % 9, projected_years)]
 
 
 def calculate_vimshottari_dasha(moon_lon: float, birth_jd: float, current_jd: Optional[float] = None) -> Dict[str, Any]:
@@ -155,8 +218,8 @@ def calculate_vimshottari_dasha(moon_lon: float, birth_jd: float, current_jd: Op
     
     effective_elapsed = elapsed_days % total_cycle_days
     
-    start_index = PLANET_SEQUENCE.index(star_lord)
-    birth_maha_total_days = DASHA_PERIODS[star_lord] * DAYS_PER_YEAR
+    start_index = LORD_TO_IDX[star_lord]
+    birth_maha_total_days = PERIOD_DAYS[start_index]
     birth_maha_rem_days = birth_maha_total_days * prop_remaining
     
     # 1. Find Current Maha Dasha
@@ -171,17 +234,15 @@ def calculate_vimshottari_dasha(moon_lon: float, birth_jd: float, current_jd: Op
         maha_elapsed_in_period = birth_maha_total_days - maha_rem_days
     else:
         current_days -= birth_maha_rem_days
-        for i in range(1, 10):
-            idx = (start_index + i) % 9
-            lord = PLANET_SEQUENCE[idx]
-            period_days = DASHA_PERIODS[lord] * DAYS_PER_YEAR
-            
-            if current_days < period_days:
-                current_maha = lord
-                maha_rem_days = period_days - current_days
-                maha_elapsed_in_period = current_days
-                break
-            current_days -= period_days
+        # The nine Maha Dashas after the birth lord (ending on it again):
+        # jump straight to the first one ending after current_days
+        next_idx = ROTATED_IDX[start_index][1]
+        bounds = CUM_DAYS_FROM[next_idx]
+        i = bisect_right(bounds, current_days)
+        if i < 9:
+            current_maha = PLANET_SEQUENCE[ROTATED_IDX[next_idx][i]]
+            maha_rem_days = bounds[i] - current_days
+            maha_elapsed_in_period = current_days - (bounds[i - 1] if i else 0.0)
             
     if not current_maha:
         current_maha = star_lord
@@ -189,19 +250,18 @@ def calculate_vimshottari_dasha(moon_lon: float, birth_jd: float, current_jd: Op
         maha_elapsed_in_period = 0.0
 
     # 2. Find Current Antar Dasha
-    antar_start_idx = PLANET_SEQUENCE.index(current_maha)
+    antar_start_idx = LORD_TO_IDX[current_maha]
     total_maha_years = DASHA_PERIODS[current_maha]
     
     current_antar = None
     antar_days_accum = 0.0
     antar_rem_days = 0.0
     
-    for i in range(9):
-        a_lord = PLANET_SEQUENCE[(antar_start_idx + i) % 9]
-        a_span_days = (total_maha_years * DASHA_PERIODS[a_lord] / TOTAL_DASHA_YEARS) * DAYS_PER_YEAR
+    for a_idx in ROTATED_IDX[antar_start_idx]:
+        a_span_days = total_maha_years * PERIOD_DAYS[a_idx] / TOTAL_DASHA_YEARS
         
         if maha_elapsed_in_period < antar_days_accum + a_span_days:
-            current_antar = a_lord
+            current_antar = PLANET_SEQUENCE[a_idx]
             antar_rem_days = (antar_days_accum + a_span_days) - maha_elapsed_in_period
             break
         antar_days_accum += a_span_days
@@ -230,35 +290,34 @@ def generate_kp_data(jd: float, lat: float, lon: float,
                      moon_lon: float) -> Dict[str, Any]:
     """Generate complete KP data with expert refinements."""
     try:
-        # Ensure KP Ayanamsa is set before any planetary position dependent calculation
-        swe.set_sid_mode(KP_AYANAMSA)
-        
+        # KP Ayanamsa is enforced inside calculate_placidus_cusps
         cusps = calculate_placidus_cusps(jd, lat, lon)
         
-        for h_num, data in cusps.items():
-            deg = data['cusp_degree']
-            _, star_lord, _ = get_nakshatra_info(deg)
-            data['star_lord'] = star_lord
-            data['sub_lord'] = calculate_sub_lord(deg)
-            
-        # Calculate Planetary Sub-lords
-        planets_kp = {}
-        for p_name, p_data in planetary_positions.items():
-            norm_name = p_name.capitalize()
-            # Handle 'Ascendant' separately if needed, or map 'rahu'/'true_node'?
-            # PLANET_SEQUENCE has 'Rahu', 'Ketu'.
-            # PLANET_IDS has 'rahu'.
+        # Star/sub lords for all 12 cusps and the accepted planets in one batch.
+        # Keep original p_name as key to match ChartResponse keys (lowercase usually)
+        names = [p_name for p_name in planetary_positions
+                 if p_name.capitalize() in KP_ACCEPTED_NAMES]
+        degs = [planetary_positions[p_name]['longitude'] for p_name in names]
+        n_cusps = len(cusps)
+        all_lons = np.fromiter(
+            chain((data['cusp_degree'] for data in cusps.values()), degs),
+            dtype=np.float64, count=n_cusps + len(degs)
+        )
+        star_idx, sub_idx = kp_batch(all_lons)
+        star_idx, sub_idx = star_idx.tolist(), sub_idx.tolist()
+        
+        for data, s_i, sub_i in zip(cusps.values(), star_idx, sub_idx):
+            data['star_lord'] = PLANET_SEQUENCE[s_i]
+            data['sub_lord'] = PLANET_SEQUENCE[sub_i]
             
-            if norm_name == 'Ascendant' or norm_name in ['Ketu', 'Rahu'] or norm_name in PLANET_SEQUENCE:
-                deg = p_data['longitude']
-                _, star_lord, _ = get_nakshatra_info(deg)
-                
-                # Use original p_name as key to match ChartResponse keys (lowercase usually)
-                planets_kp[p_name] = {
-                    'star_lord': star_lord,
-                    'sub_lord': calculate_sub_lord(deg),
-                    'longitude': round(deg, 4)
-                }
+        planets_kp = {
+            p_name: {
+                'star_lord': PLANET_SEQUENCE[s_i],
+                'sub_lord': PLANET_SEQUENCE[sub_i],
+                'longitude': round(deg, 4)
+            }
+            for p_name, deg, s_i, sub_i in zip(names, degs, star_idx[n_cusps:], sub_idx[n_cusps:])
+        }
 
         dasha = calculate_vimshottari_dasha(moon_lon, jd)
         
@@ -11,7 +11,9 @@ The 4 levels of signification (in order of strength):
 3. Planets in the star of the owner of a house
 4. Owner of a house sign
 """
-from typing import Dict, List, Optional, Set
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
 from backend.schemas import ChartResponse, KPPlanetInfo
 
 # Sign to Lord mapping (Vedic rulership)
@@ -29,6 +31,34 @@ PLANET_CODES: Dict[str, str] = {
     "Ascendant": "Asc"
 }
 
+# House numbers 1-12, and (number, payload key) pairs for the house payload
+HOUSE_NUMBERS = tuple(range(1, 13))
+HOUSE_KEYS = tuple((house_num, str(house_num)) for house_num in HOUSE_NUMBERS)
+
+# Planets in the AI payload as (name, code, lowercase key), in output order
+PAYLOAD_PLANETS = tuple(
+    (name, PLANET_CODES[name], name.lower())
+    for name in ("Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu", "Ascendant")
+)
+
+
+def planet_code_of(planet_name: str) -> str:
+    """Short code for a planet; unknown names fall back to their first 2 letters."""
+    return PLANET_CODES.get(planet_name) or planet_name[:2]
+
+
+# Raw planet key (lowercase or canonical) -> canonical capitalized name
+CANON: Dict[str, str] = {
+    **{name.lower(): name for name in PLANET_CODES},
+    **{name: name for name in PLANET_CODES}
+}
+
+
+def canonical_name(planet_name: str) -> str:
+    """Capitalized planet name, from the table when the spelling is known."""
+    return CANON.get(planet_name) or planet_name.capitalize()
+
+
 SIGN_CODES: Dict[int, str] = {
     0: "Ari", 1: "Tau", 2: "Gem", 3: "Can", 4: "Leo", 5: "Vir",
     6: "Lib", 7: "Sco", 8: "Sag", 9: "Cap", 10: "Aqu", 11: "Pis"
@@ -39,21 +69,35 @@ SIGN_NAMES: Dict[int, str] = {
     6: "Libra", 7: "Scorpio", 8: "Sagittarius", 9: "Capricorn", 10: "Aquarius", 11: "Pisces"
 }
 
+# Sign lord by sign number (0=Aries ... 11=Pisces)
+SIGN_LORDS_BY_NUM = tuple(SIGN_LORDS[SIGN_NAMES[i]] for i in range(12))
+
+
+def _lower_keys(mapping: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Case-normalized view of a planet-keyed mapping (keys lowercased).
+    Keys already in lowercase win over other spellings of the same name.
+    """
+    normalized = {k.lower(): v for k, v in mapping.items()}
+    normalized.update((k, v) for k, v in mapping.items() if k.islower())
+    return normalized
+
 
-def get_house_occupants(chart: ChartResponse) -> Dict[int, List[str]]:
+def get_house_occupants(chart: ChartResponse) -> Dict[int, Tuple[str, ...]]:
     """
-    Returns a mapping of house number -> list of planet names occupying that house.
+    Returns a mapping of house number -> planet names occupying that house.
+    Only occupied houses are present, in ascending house order.
     """
-    occupants: Dict[int, List[str]] = {i: [] for i in range(1, 13)}
+    occupants: Dict[int, List[str]] = defaultdict(list)
     
     for planet_name, planet_data in chart.planets.items():
         if planet_name.lower() == "ascendant":
             continue
         house = getattr(planet_data, 'house', None)
         if house and 1 <= house <= 12:
-            occupants[house].append(planet_name.capitalize())
+            occupants[house].append(canonical_name(planet_name))
     
-    return occupants
+    return {house: tuple(occupants[house]) for house in sorted(occupants)}
 
 
 def get_house_owners(chart: ChartResponse) -> Dict[int, str]:
@@ -64,13 +108,98 @@ def get_house_owners(chart: ChartResponse) -> Dict[int, str]:
     owners: Dict[int, str] = {}
     
     for house_num, house_data in chart.houses.items():
-        sign_name = getattr(house_data, 'sign', None)
-        if sign_name and sign_name in SIGN_LORDS:
-            owners[house_num] = SIGN_LORDS[sign_name]
+        owner = _house_owner(house_data)
+        if owner:
+            owners[house_num] = owner
     
     return owners
 
 
+def _house_owner(house_data: Any) -> Optional[str]:
+    """Lord of the sign on a house cusp, or None if the sign is unknown."""
+    sign_num = getattr(house_data, 'sign_num', None)
+    if sign_num is not None and 0 <= sign_num < 12:
+        return SIGN_LORDS_BY_NUM[sign_num]
+    # Legacy fallback: resolve by sign name
+    return SIGN_LORDS.get(getattr(house_data, 'sign', None) or "")
+
+
+def _chart_indices(chart: ChartResponse) -> Tuple[
+    Dict[str, List[int]], Dict[str, List[int]], Dict[str, str],
+    Dict[str, Any], Dict[str, KPPlanetInfo]
+]:
+    """
+    Builds every lookup the significator engine needs in one pass per source.
+    
+    Returns:
+        (occupant_to_houses, owner_to_houses, star_lord_map, planets_norm, kp_norm)
+        where planets_norm / kp_norm are keyed by lowercase planet name.
+    """
+    occupant_to_houses: Dict[str, List[int]] = defaultdict(list)
+    owner_to_houses: Dict[str, List[int]] = defaultdict(list)
+    star_lord_map: Dict[str, str] = {}
+    planets_norm: Dict[str, Any] = {}
+    kp_norm: Dict[str, KPPlanetInfo] = {}
+    
+    for planet_name, planet_data in chart.planets.items():
+        name_lower = planet_name.lower()
+        # Same precedence as _lower_keys: lowercase keys win
+        if planet_name == name_lower or name_lower not in planets_norm:
+            planets_norm[name_lower] = planet_data
+        if name_lower == "ascendant":
+            continue
+        house = getattr(planet_data, 'house', None)
+        if house and 1 <= house <= 12:
+            occupant_to_houses[canonical_name(planet_name)].append(house)
+    
+    for house_num, house_data in chart.houses.items():
+        owner = _house_owner(house_data)
+        if owner:
+            owner_to_houses[owner].append(house_num)
+    
+    if chart.kp_data and chart.kp_data.planets:
+        for planet_name, kp_info in chart.kp_data.planets.items():
+            star_lord_map[canonical_name(planet_name)] = kp_info.star_lord
+            name_lower = planet_name.lower()
+            if planet_name == name_lower or name_lower not in kp_norm:
+                kp_norm[name_lower] = kp_info
+    
+    return occupant_to_houses, owner_to_houses, star_lord_map, planets_norm, kp_norm
+
+
+def get_occupant_houses(house_occupants: Dict[int, Tuple[str, ...]]) -> Dict[str, List[int]]:
+    """
+    Inverts house occupants into planet name -> houses it occupies.
+    """
+    occupant_to_houses: Dict[str, List[int]] = defaultdict(list)
+    
+    for house_num, occupants in house_occupants.items():
+        for occupant in occupants:
+            occupant_to_houses[occupant].append(house_num)
+    
+    return occupant_to_houses
+
+
+def get_owner_houses(house_owners: Dict[int, str]) -> Dict[str, List[int]]:
+    """
+    Inverts house owners into planet name -> houses it owns.
+    """
+    owner_to_houses: Dict[str, List[int]] = defaultdict(list)
+    
+    for house_num, owner in house_owners.items():
+        owner_to_houses[owner].append(house_num)
+    
+    return owner_to_houses
+
+
+def _house_mask(houses: List[int]) -> int:
+    """Bitmask with bit h set for every house h in houses."""
+    mask = 0
+    for house_num in houses:
+        mask |= 1 << house_num
+    return mask
+
+
 def get_star_lord_map(chart: ChartResponse) -> Dict[str, str]:
     """
     Returns a mapping of planet name -> star lord name.
@@ -80,7 +209,7 @@ def get_star_lord_map(chart: ChartResponse) -> Dict[str, str]:
     
     if chart.kp_data and chart.kp_data.planets:
         for planet_name, kp_info in chart.kp_data.planets.items():
-            star_lords[planet_name.capitalize()] = kp_info.star_lord
+            star_lords[canonical_name(planet_name)] = kp_info.star_lord
     
     return star_lords
 
@@ -88,9 +217,10 @@ def get_star_lord_map(chart: ChartResponse) -> Dict[str, str]:
 def calculate_planet_significators(
     planet_name: str, 
     chart: ChartResponse,
-    house_occupants: Optional[Dict[int, List[str]]] = None,
-    house_owners: Optional[Dict[int, str]] = None,
-    star_lord_map: Optional[Dict[str, str]] = None
+    occupant_to_houses: Optional[Dict[str, List[int]]] = None,
+    owner_to_houses: Optional[Dict[str, List[int]]] = None,
+    star_lord_map: Optional[Dict[str, str]] = None,
+    planets_norm: Optional[Dict[str, Any]] = None
 ) -> List[int]:
     """
     Calculates the house significators for a given planet using KP 4-fold rules.
@@ -98,61 +228,183 @@ def calculate_planet_significators(
     Args:
         planet_name: Name of the planet (e.g., "Sun", "Moon")
         chart: The complete chart response with KP and house data
-        house_occupants: Pre-computed house occupants (optional, for performance)
-        house_owners: Pre-computed house owners (optional, for performance)
+        occupant_to_houses: Pre-computed planet -> occupied houses (optional, for performance)
+        owner_to_houses: Pre-computed planet -> owned houses (optional, for performance)
         star_lord_map: Pre-computed star lord map (optional, for performance)
+        planets_norm: chart.planets keyed by lowercase name (optional, for performance)
     
     Returns:
         Sorted, deduplicated list of house numbers this planet signifies.
         Example: [2, 7, 11]
     """
-    significators: Set[int] = set()
-    
-    planet_key = planet_name.capitalize()
+    planet_key = canonical_name(planet_name)
     
     # Use pre-computed data if provided, otherwise compute (for backward compatibility)
-    if house_occupants is None:
-        house_occupants = get_house_occupants(chart)
-    if house_owners is None:
-        house_owners = get_house_owners(chart)
+    if occupant_to_houses is None:
+        occupant_to_houses = get_occupant_houses(get_house_occupants(chart))
+    if owner_to_houses is None:
+        owner_to_houses = get_owner_houses(get_house_owners(chart))
     if star_lord_map is None:
         star_lord_map = get_star_lord_map(chart)
+    if planets_norm is None:
+        planets_norm = _lower_keys(chart.planets)
+    
+    # Signified houses as a bitmask: bit h set <=> house h
+    # Level 4: Direct ownership
+    mask = _house_mask(owner_to_houses.get(planet_key, ()))
     
     # Get this planet's star lord
     planet_star_lord = star_lord_map.get(planet_key)
-    
-    # --- Level 1 & 2: Signification through Occupation ---
-    # Check if this planet's star lord occupies any house
     if planet_star_lord:
-        for house_num, occupants in house_occupants.items():
-            if planet_star_lord in occupants:
-                # Level 1: Planet in star of occupant signifies that house
-                significators.add(house_num)
+        # Level 1: Planet in star of occupant signifies that house
+        mask |= _house_mask(occupant_to_houses.get(planet_star_lord, ()))
+        # Level 3: Planet in star of owner signifies that house
+        mask |= _house_mask(owner_to_houses.get(planet_star_lord, ()))
     
     # Level 2: Direct occupation
-    planet_data = chart.planets.get(planet_key.lower()) or chart.planets.get(planet_key)
+    planet_data = planets_norm.get(planet_name.lower())
     if planet_data:
         house = getattr(planet_data, 'house', None)
         if house and 1 <= house <= 12:
-            significators.add(house)
+            mask |= 1 << house
     
-    # --- Level 3 & 4: Signification through Ownership ---
-    # Check if this planet's star lord owns any house
-    if planet_star_lord:
-        for house_num, owner in house_owners.items():
-            if owner == planet_star_lord:
-                # Level 3: Planet in star of owner signifies that house
-                significators.add(house_num)
+    return [h for h in HOUSE_NUMBERS if mask >> h & 1]
+
+
+
+# Planet index used by the batch arrays (payload order; Ascendant last)
+BATCH_PLANET_INDEX: Dict[str, int] = {name: i for i, (name, _, _) in enumerate(PAYLOAD_PLANETS)}
+_BATCH_HOUSES = np.arange(1, 13, dtype=np.int8)
+
+
+def encode_chart_arrays(chart: ChartResponse) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encodes a chart as the small integer arrays consumed by calculate_significators_batch.
+    
+    Returns:
+        (planet_house[10], planet_star_lord[10], house_owner[12]) as int8 arrays,
+        indexed by BATCH_PLANET_INDEX. Missing houses are 0, missing lords -1.
+    """
+    _, owner_to_houses, star_lord_map, planets_norm, _ = _chart_indices(chart)
+    n_planets = len(PAYLOAD_PLANETS)
+    planet_house = np.zeros(n_planets, dtype=np.int8)
+    planet_star_lord = np.full(n_planets, -1, dtype=np.int8)
+    house_owner = np.full(12, -1, dtype=np.int8)
+    
+    for i, (name, _, name_lower) in enumerate(PAYLOAD_PLANETS):
+        house = getattr(planets_norm.get(name_lower), 'house', None)
+        if house and 1 <= house <= 12:
+            planet_house[i] = house
+        planet_star_lord[i] = BATCH_PLANET_INDEX.get(star_lord_map.get(name), -1)
+    
+    for owner, houses in owner_to_houses.items():
+        owner_idx = BATCH_PLANET_INDEX.get(owner, -1)
+        for house_num in houses:
+            house_owner[house_num - 1] = owner_idx
+    
+    return planet_house, planet_star_lord, house_owner
+
+
+def calculate_significators_batch(
+    planet_house: np.ndarray,
+    planet_star_lord: np.ndarray,
+    house_owner: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized KP 4-fold significators for a stack of charts.
+    
+    Args:
+        planet_house: (N, 10) occupied house per planet, 0 if unknown
+        planet_star_lord: (N, 10) star lord index per planet, -1 if unknown
+        house_owner: (N, 12) owner index per house (1-12), -1 if unknown
+    
+    Returns:
+        (N, 10, 12) bool array; [n, p, h - 1] is True when planet p of chart n
+        signifies house h. Single charts (1-D inputs) give a (10, 12) array.
+    """
+    planet_house = np.asarray(planet_house, dtype=np.int8)
+    planet_star_lord = np.asarray(planet_star_lord, dtype=np.int8)
+    house_owner = np.asarray(house_owner, dtype=np.int8)
+    single = planet_house.ndim == 1
+    if single:
+        planet_house, planet_star_lord, house_owner = (
+            planet_house[None], planet_star_lord[None], house_owner[None]
+        )
+    
+    planet_idx = np.arange(planet_house.shape[1], dtype=np.int8)
+    has_star = (planet_star_lord >= 0)[:, :, None]
+    star_idx = np.where(planet_star_lord >= 0, planet_star_lord, 0)
+    star_house = np.take_along_axis(planet_house, star_idx, axis=1)
     
     # Level 4: Direct ownership
-    for house_num, owner in house_owners.items():
-        if owner == planet_key:
-            significators.add(house_num)
+    result = house_owner[:, None, :] == planet_idx[None, :, None]
+    # Level 2: Direct occupation
+    result |= planet_house[:, :, None] == _BATCH_HOUSES
+    # Level 1: Planet in star of occupant signifies that house
+    result |= has_star & (star_house[:, :, None] == _BATCH_HOUSES)
+    # Level 3: Planet in star of owner signifies that house
+    result |= has_star & (house_owner[:, None, :] == planet_star_lord[:, :, None])
+    
+    return result[0] if single else result
+
+
+def calculate_chart_significators_batch(charts: Sequence[ChartResponse]) -> np.ndarray:
+    """(N, 10, 12) significator matrix for many charts; see calculate_significators_batch."""
+    if not charts:
+        return np.zeros((0, len(PAYLOAD_PLANETS), 12), dtype=bool)
+    encoded = [encode_chart_arrays(chart) for chart in charts]
+    return calculate_significators_batch(*(np.stack(column) for column in zip(*encoded)))
+
+
+# (builder name, chart content fingerprint) -> payload; equal charts share an entry
+PAYLOAD_CACHE_SIZE = 256
+_payload_cache: Dict[Tuple[str, tuple], Dict[str, tuple]] = {}
+
+
+def _payload_fingerprint(chart: ChartResponse) -> tuple:
+    """Every chart input the payload builders read: positions, cusps, KP lords, Shadbala."""
+    kp_data = chart.kp_data
+    return (
+        tuple(
+            (name, getattr(p, 'sign_num', None), getattr(p, 'house', None))
+            for name, p in chart.planets.items()
+        ),
+        tuple(
+            (num, getattr(h, 'sign_num', None), getattr(h, 'sign', None))
+            for num, h in chart.houses.items()
+        ),
+        tuple(
+            (name, k.star_lord, k.sub_lord) for name, k in kp_data.planets.items()
+        ) if kp_data and kp_data.planets else None,
+        tuple(
+            (num, c.sign_num, c.sub_lord) for num, c in kp_data.cusps.items()
+        ) if kp_data and kp_data.cusps else None,
+        tuple(chart.shadbala.total_shadbala.items()) if chart.shadbala else None,
+    )
+
+
+def _memoized_payload(builder: Callable[[ChartResponse], Dict[str, tuple]],
+                      chart: ChartResponse) -> Dict[str, tuple]:
+    """
+    Returns builder(chart), memoized on the content of the inputs it reads.
     
-    return sorted(list(significators))
+    Replacing or editing a chart's houses, planets, kp_data or shadbala
+    changes the fingerprint, so stale payloads are never served. Entries are
+    immutable tuples; callers get a fresh dict, so rewriting the returned
+    payload never leaks into the cache.
+    """
+    key = (builder.__name__, _payload_fingerprint(chart))
+    payload = _payload_cache.get(key)
+    if payload is None:
+        payload = builder(chart)
+        if len(_payload_cache) >= PAYLOAD_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            _payload_cache.pop(next(iter(_payload_cache)), None)
+        _payload_cache[key] = payload
+    return dict(payload)
 
 
-def build_optimized_planet_payload(chart: ChartResponse) -> Dict[str, List]:
+def build_optimized_planet_payload(chart: ChartResponse) -> Dict[str, tuple]:
     """
     Builds the optimized planet payload for AI context.
     
@@ -160,81 +412,88 @@ def build_optimized_planet_payload(chart: ChartResponse) -> Dict[str, List]:
             [Sign, Star_Lord, Sub_Lord, Shadbala, [Significators]]
     
     Returns:
-        Dictionary with 2-letter planet codes as keys.
+        Dictionary with 2-letter planet codes as keys and immutable tuples
+        as values (serialized as JSON arrays).
+    """
+    return _memoized_payload(_build_planet_payload, chart)
+
+
+def build_optimized_house_payload(chart: ChartResponse) -> Dict[str, tuple]:
     """
-    payload: Dict[str, List] = {}
+    Builds the optimized house cusp payload for AI context.
     
-    # === PERFORMANCE: Pre-compute helper data ONCE ===
-    house_occupants = get_house_occupants(chart)
-    house_owners = get_house_owners(chart)
-    star_lord_map = get_star_lord_map(chart)
+    Format: "1": ["Pis", "Rah"]
+            [Cusp_Sign, Sub_Lord]
+    
+    Returns:
+        Dictionary with house number strings as keys and tuple values.
+    """
+    return _memoized_payload(_build_house_payload, chart)
+
+
+def _build_planet_payload(chart: ChartResponse) -> Dict[str, tuple]:
+    """Uncached body of build_optimized_planet_payload."""
+    payload: Dict[str, tuple] = {}
+    
+    # === PERFORMANCE: Pre-compute helper data ONCE, in a single traversal ===
+    (occupant_to_houses, owner_to_houses, star_lord_map,
+     planets_norm, kp_planets) = _chart_indices(chart)
     
     # Get Shadbala scores if available (normalize keys for consistent lookup)
     shadbala_scores: Dict[str, float] = {}
     if chart.shadbala and chart.shadbala.total_shadbala:
-        shadbala_scores = {k.lower(): v for k, v in chart.shadbala.total_shadbala.items()}
+        shadbala_scores = chart.shadbala.normalized
     
-    # Get KP data
-    kp_planets: Dict[str, KPPlanetInfo] = {}
-    if chart.kp_data and chart.kp_data.planets:
-        kp_planets = chart.kp_data.planets
-    
-    planets_to_process = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu", "Ascendant"]
-    
-    for planet_name in planets_to_process:
-        planet_code = PLANET_CODES.get(planet_name, planet_name[:2])
-        
+    for planet_name, planet_code, name_lower in PAYLOAD_PLANETS:
         # Get planet position
-        planet_data = chart.planets.get(planet_name.lower()) or chart.planets.get(planet_name)
+        planet_data = planets_norm.get(name_lower)
         if not planet_data:
             continue
         
+        # KP data (Star/Sub Lords); planets without it carry no KP signification
+        kp_info = kp_planets.get(name_lower)
+        if kp_info:
+            star_lord, sub_lord = planet_code_of(kp_info.star_lord), planet_code_of(kp_info.sub_lord)
+        elif planet_name != "Ascendant":
+            continue
+        else:
+            star_lord = sub_lord = "?"
+        
         # Sign code
         sign_num = getattr(planet_data, 'sign_num', 1)
         sign_code = SIGN_CODES.get(sign_num, "?")
         
-        # KP data (Star/Sub Lords)
-        kp_info = kp_planets.get(planet_name.lower()) or kp_planets.get(planet_name)
-        star_lord = PLANET_CODES.get(kp_info.star_lord, kp_info.star_lord[:2]) if kp_info else "?"
-        sub_lord = PLANET_CODES.get(kp_info.sub_lord, kp_info.sub_lord[:2]) if kp_info else "?"
-        
         # Shadbala (None for Rahu/Ketu) - use lowercase lookup
-        strength = shadbala_scores.get(planet_name.lower())
+        strength = shadbala_scores.get(name_lower)
         if strength:
             strength = round(strength, 1)
         
         # Significators (pass pre-computed data for performance)
         significators = calculate_planet_significators(
-            planet_name, chart, house_occupants, house_owners, star_lord_map
+            planet_name, chart, occupant_to_houses, owner_to_houses, star_lord_map,
+            planets_norm
         )
         
-        payload[planet_code] = [sign_code, star_lord, sub_lord, strength, significators]
+        payload[planet_code] = (sign_code, star_lord, sub_lord, strength, tuple(significators))
     
     return payload
 
 
-def build_optimized_house_payload(chart: ChartResponse) -> Dict[str, List]:
-    """
-    Builds the optimized house cusp payload for AI context.
-    
-    Format: "1": ["Pis", "Rah"]
-            [Cusp_Sign, Sub_Lord]
-    
-    Returns:
-        Dictionary with house number strings as keys.
-    """
-    payload: Dict[str, List] = {}
+def _build_house_payload(chart: ChartResponse) -> Dict[str, tuple]:
+    """Uncached body of build_optimized_house_payload."""
+    payload: Dict[str, tuple] = {}
     
     if not chart.kp_data or not chart.kp_data.cusps:
         return payload
     
-    for house_num in range(1, 13):
-        cusp = chart.kp_data.cusps.get(house_num)
+    cusps = chart.kp_data.cusps
+    for house_num, house_key in HOUSE_KEYS:
+        cusp = cusps.get(house_num)
         if cusp:
             sign_num = cusp.sign_num
             sign_code = SIGN_CODES.get(sign_num, "?")
-            sub_lord = PLANET_CODES.get(cusp.sub_lord, cusp.sub_lord[:2]) if cusp.sub_lord else "?"
+            sub_lord = planet_code_of(cusp.sub_lord) if cusp.sub_lord else "?"
             
-            payload[str(house_num)] = [sign_code, sub_lord]
+            payload[house_key] = (sign_code, sub_lord)
     
     return payload
@@ -1,27 +1,131 @@
 import asyncio
+import os
+import sqlite3
+import threading
+import time
 from functools import lru_cache
+from typing import Dict, Optional, Tuple
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
 from backend.logger import logger
 
+# Shared geocoder: reuses its HTTP adapter/connection pool across lookups
+_GEOLOCATOR = Nominatim(user_agent="astro_chatbot_mvp")
+
+# Persistent geocoding cache (survives restarts; Nominatim allows ~1 req/s).
+# Defaults to the user cache dir so runs never write into the working directory.
+GEOCACHE_PATH = os.getenv("GEOCACHE_PATH") or os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "ai_astrologer", "geocache.sqlite3"
+)
+GEOCACHE_TTL_SECONDS = 30 * 86400
+
+_geocache_conn: Optional[sqlite3.Connection] = None
+_geocache_lock = threading.Lock()
+
+
+def _geocache() -> sqlite3.Connection:
+    """Open (once) the SQLite geocoding cache, creating the table if needed."""
+    global _geocache_conn
+    if _geocache_conn is None:
+        cache_dir = os.path.dirname(GEOCACHE_PATH)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        conn = sqlite3.connect(GEOCACHE_PATH, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocache ("
+            "place TEXT PRIMARY KEY, latitude REAL, longitude REAL, "
+            "address TEXT, cached_at REAL)"
+        )
+        conn.commit()
+        _geocache_conn = conn
+    return _geocache_conn
+
+
+def _geocache_get(place_name: str) -> Optional[Tuple[float, float, str]]:
+    """Fresh cached (lat, lon, address) for a place, or None."""
+    try:
+        with _geocache_lock:
+            row = _geocache().execute(
+                "SELECT latitude, longitude, address FROM geocache "
+                "WHERE place = ? AND cached_at > ?",
+                (place_name, time.time() - GEOCACHE_TTL_SECONDS)
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning("Geocoding cache read failed: %s", e)
+        return None
+    return tuple(row) if row else None
+
+
+def _geocache_put(place_name: str, result: Tuple[float, float, str]) -> None:
+    """Store a successful lookup; cache failures never block geocoding."""
+    try:
+        with _geocache_lock:
+            conn = _geocache()
+            conn.execute(
+                "INSERT OR REPLACE INTO geocache VALUES (?, ?, ?, ?, ?)",
+                (place_name, *result, time.time())
+            )
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.warning("Geocoding cache write failed: %s", e)
+
+
 @lru_cache(maxsize=500)
-def _sync_geocoding_lookup(place_name: str):
-    """Synchronous cached geocoding lookup."""
-    geolocator = Nominatim(user_agent="astro_chatbot_mvp")
-    return geolocator.geocode(place_name)
+def _sync_geocoding_lookup(place_name: str) -> Optional[Tuple[float, float, str]]:
+    """
+    Synchronous cached geocoding lookup: memory, then disk, then Nominatim.
+    
+    GEOCACHE_TTL_SECONDS applies to the SQLite layer only: a result held in
+    this in-process lru_cache is reused for the life of the process.
+    """
+    cached = _geocache_get(place_name)
+    if cached is not None:
+        return cached
+
+    location = _GEOLOCATOR.geocode(place_name)
+    if not location:
+        return None
+
+    result = (location.latitude, location.longitude, location.address)
+    _geocache_put(place_name, result)
+    return result
+
+# place_name -> Future of the lookup currently in flight for it
+_inflight: Dict[str, asyncio.Future] = {}
 
 async def get_location_data(place_name):
     """
     Returns (latitude, longitude, address) for a given place name.
     Returns None if not found or error.
+    Concurrent calls for the same place share a single upstream lookup.
     """
+    pending = _inflight.get(place_name)
+    if pending is not None:
+        # shield: a cancelled waiter must not cancel the shared lookup
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[place_name] = future
+    try:
+        result = await _lookup_location(place_name)
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved in case nobody else was waiting
+        raise
+    finally:
+        _inflight.pop(place_name, None)
+
+async def _lookup_location(place_name):
+    """Threaded geocoding lookup, mapping service errors to None."""
     try:
-        logger.info(f"Looking up location: {place_name}")
-        location = await asyncio.to_thread(_sync_geocoding_lookup, place_name)
-        if location:
-            return location.latitude, location.longitude, location.address
-        else:
-            return None
+        logger.info("Looking up location: %s", place_name)
+        return await asyncio.to_thread(_sync_geocoding_lookup, place_name)
     except (GeocoderTimedOut, GeocoderUnavailable) as e:
-        logger.error(f"Geocoding service error: {str(e)}")
+        logger.error("Geocoding service error: %s", e)
         return None
@@ -1,11 +1,15 @@
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 def setup_logger(name="ai_astrologer"):
     """
     Sets up a professional, industry-standard logger with console and file output.
     Includes log rotation to prevent massive file sizes.
+    Records are handed to a queue; a background listener thread does the
+    console/file I/O so logging never blocks the calling thread.
     """
     # Create logs directory if it doesn't exist
     log_dir = "logs"
@@ -45,9 +49,13 @@ def setup_logger(name="ai_astrologer"):
     console_handler.setFormatter(formatter)
     file_handler.setFormatter(formatter)
 
-    # Add handlers to the logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Route records through a queue; the listener owns the real handlers
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Flush pending records on exit
+    
+    logger.addHandler(QueueHandler(log_queue))
 
     return logger
 
@@ -1,9 +1,11 @@
 # backend/nakshatra_data.py
 """
 Nakshatra database with all 27 lunar mansions
-Each nakshatra spans 13°20' (13.333°)
-Mapping: Longitude / 13.333 = Nakshatra number (0-26)
+Each nakshatra spans 13°20' (360/27°), split into 4 padas of 3°20'
+Mapping: pada index = int(lon * 108/360) % 108; >> 2 gives the
+Nakshatra number (0-26) and & 3 the pada (0-3)
 """
+import numpy as np
 
 NAKSHATRAS = [
     {
@@ -467,31 +469,63 @@ NAKSHATRAS = [
     }
 ]
 
+# Columnar views of NAKSHATRAS (indexed by nakshatra number) for hot lookups
+NAKSHATRA_NAMES = tuple(nak['name'] for nak in NAKSHATRAS)
+NAKSHATRA_LORDS = tuple(nak['lord'] for nak in NAKSHATRAS)
+NAKSHATRA_SYMBOLS = tuple(nak['symbol'] for nak in NAKSHATRAS)
+NAKSHATRA_ELEMENTS = tuple(nak['element'] for nak in NAKSHATRAS)
+
+# Numeric record array of the scalar fields, for vectorized lookups such as
+# NAKSHATRA_RECORDS['lord'][nakshatra_nums]; lord/element are indices into
+# NAKSHATRA_LORD_NAMES / NAKSHATRA_ELEMENT_NAMES
+NAKSHATRA_LORD_NAMES = tuple(dict.fromkeys(NAKSHATRA_LORDS))  # Vimshottari order
+NAKSHATRA_ELEMENT_NAMES = tuple(dict.fromkeys(NAKSHATRA_ELEMENTS))
+NAKSHATRA_RECORDS = np.array(
+    [
+        (nak['number'], NAKSHATRA_LORD_NAMES.index(nak['lord']),
+         NAKSHATRA_ELEMENT_NAMES.index(nak['element']), nak['lucky_number'])
+        for nak in NAKSHATRAS
+    ],
+    dtype=[('number', 'u1'), ('lord', 'u1'), ('element', 'u1'), ('lucky_number', 'u1')]
+)
+
+PADAS_PER_DEGREE = 108 / 360  # 27 nakshatras x 4 padas, each pada exactly 3°20'
+
 def get_nakshatra_by_longitude(longitude):
     """
     Calculate nakshatra from longitude (0-360°)
     Returns: nakshatra_dict, pada_number
     
-    Logic: Each nakshatra = 13°20' = 13.333°
-    Pada (quarter) = 3°20' = 3.333°
+    Logic: Each nakshatra = 13°20' = 360/27°, split into 4 padas of 3°20'.
+    Counting whole padas (0-107) from 0° Aries gives both at once.
     """
-    # Normalize to 0-360
-    longitude = longitude % 360
+    pada_index = int((longitude % 360) * PADAS_PER_DEGREE) % 108
     
-    # Which nakshatra (0-26)
-    nakshatra_num = int(longitude / 13.33333)
-    if nakshatra_num >= 27:
-        nakshatra_num = 26
+    return NAKSHATRAS[pada_index >> 2], (pada_index & 3) + 1
+
+def get_nakshatras_by_longitudes(longitudes):
+    """
+    Vectorized get_nakshatra_by_longitude for many longitudes at once
+    (e.g. a transit sweep over thousands of samples).
+    Returns: (nakshatra indices 0-26, pada numbers 1-4) as int8 arrays;
+    index NAKSHATRAS with the first to get the dicts.
     
-    # Which pada (quarter) within nakshatra (1-4)
-    position_in_nakshatra = longitude % 13.33333
-    pada = int(position_in_nakshatra / 3.33333) + 1
+    Math stays in float64: float32 longitudes are only good to ~3e-5° near
+    360°, enough to move samples across a pada boundary.
+    """
+    scaled = np.mod(longitudes, 360.0, dtype=np.float64)
+    scaled *= PADAS_PER_DEGREE
+    pada_indices = scaled.astype(np.int8)  # 0-108, fits int8
+    pada_indices %= 108
     
-    return NAKSHATRAS[nakshatra_num], pada
+    nakshatra_nums = pada_indices >> 2
+    pada_indices &= 3
+    pada_indices += 1
+    return nakshatra_nums, pada_indices
 
-def get_nakshatra_details(nakshatra_dict, pada):
+def _render_nakshatra_details(nakshatra_dict, pada):
     """
-    Returns formatted details for display
+    Builds the display text for a nakshatra (pada may be any string)
     """
     details = f"""
 ╔═══════════════════════════════════════════════════════╗
@@ -534,3 +568,36 @@ def get_nakshatra_details(nakshatra_dict, pada):
 Lucky Day: {nakshatra_dict['lucky_day']} | Lucky Number: {nakshatra_dict['lucky_number']}
 """
     return details
+
+_PADA_MARKER = "\0pada\0"
+
+# Static display text per nakshatra, split around the pada number
+_RENDERED_DETAILS = tuple(
+    tuple(_render_nakshatra_details(nak, _PADA_MARKER).split(_PADA_MARKER))
+    for nak in NAKSHATRAS
+)
+
+# UTF-8 encoded pieces for byte-oriented outputs (files, sockets)
+_RENDERED_DETAILS_UTF8 = tuple(
+    (prefix.encode('utf-8'), suffix.encode('utf-8')) for prefix, suffix in _RENDERED_DETAILS
+)
+
+def get_nakshatra_details(nakshatra_dict, pada):
+    """
+    Returns formatted details for display
+    """
+    number = nakshatra_dict.get('number')
+    if isinstance(number, int) and 0 <= number < 27 and NAKSHATRAS[number] is nakshatra_dict:
+        prefix, suffix = _RENDERED_DETAILS[number]
+        return prefix + str(pada) + suffix
+    return _render_nakshatra_details(nakshatra_dict, pada)
+
+def get_nakshatra_details_bytes(nakshatra_dict, pada):
+    """
+    get_nakshatra_details as UTF-8 bytes, without re-encoding the static text
+    """
+    number = nakshatra_dict.get('number')
+    if isinstance(number, int) and 0 <= number < 27 and NAKSHATRAS[number] is nakshatra_dict:
+        prefix, suffix = _RENDERED_DETAILS_UTF8[number]
+        return prefix + str(pada).encode('utf-8') + suffix
+    return _render_nakshatra_details(nakshatra_dict, pada).encode('utf-8')
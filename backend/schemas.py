@@ -1,5 +1,16 @@
-from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import Dict, List, Optional, Union, Any
+from pydantic import BaseModel, BeforeValidator, Field, ConfigDict
+from functools import cached_property
+from typing import Annotated, Dict, List, Optional, Union, Any
+
+def _round2(v):
+    return round(v, 2) if isinstance(v, float) else v
+
+def _round4(v):
+    return round(v, 4) if isinstance(v, float) else v
+
+# Floats rounded on input to 2 / 4 decimal places
+Round2 = Annotated[float, BeforeValidator(_round2)]
+Round4 = Annotated[float, BeforeValidator(_round4)]
 
 class NakshatraInfo(BaseModel):
     nakshatra: str
@@ -8,12 +19,14 @@ class NakshatraInfo(BaseModel):
     symbol: Optional[str] = None
     element: Optional[str] = None
 
+    model_config = ConfigDict(frozen=True)
+
 class PlanetPosition(BaseModel):
     name: str
     sign: str
-    degree: float
+    degree: Round2
     sign_num: int
-    abs_pos: float
+    abs_pos: Round2
     speed: float = 0.0 # Daily motion in degrees (New for Chesta Bala)
     declination: float = 0.0 # Declination in degrees (New for Ayana Bala)
     is_retrograde: bool = False
@@ -23,53 +36,39 @@ class PlanetPosition(BaseModel):
     relationship: Optional[str] = None
     nakshatra: Optional[NakshatraInfo] = None
 
-    @field_validator('degree', 'abs_pos', mode='before')
-    @classmethod
-    def round_floats(cls, v):
-        return round(v, 2) if isinstance(v, float) else v
+    model_config = ConfigDict(frozen=True)
 
 class ChartMetadata(BaseModel):
     name: str
     datetime: str
     location: str
-    latitude: float
-    longitude: float
-    ayanamsa: float
+    latitude: Round2
+    longitude: Round2
+    ayanamsa: Round2
     zodiac_system: str
     house_system: str
     gender: Optional[str] = None
 
-    @field_validator('latitude', 'longitude', 'ayanamsa', mode='before')
-    @classmethod
-    def round_floats(cls, v):
-        return round(v, 2) if isinstance(v, float) else v
-
 class VargaPlanet(BaseModel):
     """Simplified planet model for divisional charts"""
     name: str
     sign: str
     sign_num: int
-    degree: float
-    abs_pos: float
+    degree: Round2
+    abs_pos: Round2
 
-    @field_validator('degree', 'abs_pos', mode='before')
-    @classmethod
-    def round_floats(cls, v):
-        return round(v, 2) if isinstance(v, float) else v
+    model_config = ConfigDict(frozen=True)
 
 class KPCuspInfo(BaseModel):
     """KP house cusp information"""
-    cusp_degree: float
+    cusp_degree: Round4
     sign: str
     sign_num: int
-    degree_in_sign: float
+    degree_in_sign: Round4
     star_lord: str
     sub_lord: str
 
-    @field_validator('cusp_degree', 'degree_in_sign', mode='before')
-    @classmethod
-    def round_floats(cls, v):
-        return round(v, 4) if isinstance(v, float) else v
+    model_config = ConfigDict(frozen=True)
 
 class KPPlanetInfo(BaseModel):
     """KP Planet information (Sub Lord, etc)"""
@@ -77,11 +76,20 @@ class KPPlanetInfo(BaseModel):
     sub_lord: str
     longitude: float
 
+    model_config = ConfigDict(frozen=True)
+
 class ShadbalaData(BaseModel):
     """Shadbala (Planetary Strength) Data"""
     total_shadbala: Dict[str, float]
     # We can add detail breakdown fields later if needed
 
+    @cached_property
+    def normalized(self) -> Dict[str, float]:
+        """total_shadbala keyed by lowercase planet name (built once; do not mutate)"""
+        return {k.lower(): v for k, v in self.total_shadbala.items()}
+
+    model_config = ConfigDict(frozen=True)
+
 class DashaInfo(BaseModel):
     """Vimshottari Dasha information"""
     maha_dasha: Dict[str, Any]
@@ -102,8 +110,10 @@ class DashaPeriod(BaseModel):
     end_jd: float
     duration_days: float = 0.0
     duration_years: float = 0.0
-    sub_periods: List['DashaPeriod'] = []
+    sub_periods: List['DashaPeriod'] = Field(default_factory=list)
     is_current: bool = False
+
+    model_config = ConfigDict(frozen=True)
     
 class CurrentDashaState(BaseModel):
     maha_dasha: DashaPeriod
@@ -119,21 +129,16 @@ class CompleteDashaInfo(BaseModel):
 class HouseData(BaseModel):
     sign: str
     sign_num: int
-    degree: float
-    degree_in_sign: float
-    cusp_degree: float
+    degree: Round2
+    degree_in_sign: Round2
+    cusp_degree: Round2
 
-    @field_validator('degree', 'degree_in_sign', 'cusp_degree', mode='before')
-    @classmethod
-    def round_floats(cls, v):
-        return round(v, 2) if isinstance(v, float) else v
+    model_config = ConfigDict(frozen=True)
 
 class ChartResponse(BaseModel):
     metadata: ChartMetadata
     planets: Dict[str, PlanetPosition]
     houses: Dict[int, HouseData] = Field(default_factory=dict)
-    ascendant: Optional[float] = None # Deprecated? Using planets['Ascendant']
-    ayanamsa: float = 0.0 # Deprecated? In metadata
     kp_data: Optional[KPData] = None
     shadbala: Optional[ShadbalaData] = None
     complete_dasha: Optional[CompleteDashaInfo] = None # NEW
@@ -142,4 +147,4 @@ class ChartResponse(BaseModel):
     # Error field (legacy support)
     error: Optional[str] = None
     
-    model_config = ConfigDict(extra="allow")
+    model_config = ConfigDict(extra="ignore")
@@ -1,6 +1,6 @@
 
-import swisseph as swe
-from typing import Dict, List, Optional
+import numpy as np
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from backend.schemas import ChartResponse, PlanetPosition
 
 # ============================================================================
@@ -28,13 +28,79 @@ EXALTATION_POINTS = {
 # Saturn 20 Libra = 200.
 # Jupiter 5 Cancer = 95.
 
+# Deep debilitation point (exaltation + 180) per planet, for Uccha Bala
+DEBILITATION_POINTS = {
+    planet: (exalt_pt + 180) % 360 for planet, exalt_pt in EXALTATION_POINTS.items()
+}
+
 PLANET_MAPPING = {
     'Sun': 0, 'Moon': 1, 'Mars': 4, 'Mercury': 2,
     'Jupiter': 5, 'Venus': 3, 'Saturn': 6
 } # SwissEph IDs
 
+# The 7 grahas as (name, chart key, SwissEph ID), in calculation order
+GRAHAS = tuple(
+    (name, name.lower(), PLANET_MAPPING[name])
+    for name in ('Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn')
+)
+
+# Naisargika Bala indexed by SwissEph ID (0-6)
+NAISARGIKA_BY_ID = tuple(
+    NAISARGIKA_BALA[name] for name in sorted(PLANET_MAPPING, key=PLANET_MAPPING.get)
+)
+
 from backend.config import SIGN_LORDS
 
+# Sapta Vargaja Bala: the 7 divisional charts and points per relationship
+SAPTAVARGA_KEYS = ('d1_chart', 'd2_chart', 'd3_chart', 'd7_chart', 'd9_chart', 'd12_chart', 'd30_chart')
+SAPTAVARGA_POINTS = {
+    'Own': 30.0,
+    'Adhi Mitra': 22.5,
+    'Mitra': 15.0,
+    'Sama': 7.5,
+    'Shatru': 3.75,
+    'Adhi Shatru': 1.875
+}
+
+class PlanetFlags(NamedTuple):
+    """Per-graha classification used by the Sthana, Dig and Kala Bala rules."""
+    oja_odd: Optional[bool]       # Ojayugma: strong in odd (True) / even (False) signs
+    decanate: int                 # Drekkana: strong decanate (1-3), 0 = none
+    dig_offset: Optional[float]   # Dig: power point offset from the Ascendant
+    paksha_benefic: bool          # Paksha: strong towards Full Moon
+    day_strong: bool              # Natonnata
+    night_strong: bool            # Natonnata
+    ayana_sign: int               # Ayana: +1 north, -1 south declination group
+
+PLANET_FLAGS = {
+    'Sun': PlanetFlags(True, 1, 270, False, True, False, 1),
+    'Moon': PlanetFlags(False, 2, 90, True, False, True, -1),
+    'Mars': PlanetFlags(True, 1, 270, False, False, True, 1),
+    'Mercury': PlanetFlags(True, 3, 0, True, True, True, 1),
+    'Jupiter': PlanetFlags(True, 1, 0, True, True, False, 1),
+    'Venus': PlanetFlags(False, 2, 90, True, True, False, 1),
+    'Saturn': PlanetFlags(True, 3, 180, False, False, True, -1),
+}
+NO_FLAGS = PlanetFlags(None, 0, None, False, False, False, 0)
+
+# Kendradi Bala per house: Kendra 60, Panapara 30, Apoklima (and unknown) 15
+KENDRADI_POINTS = {house: (15, 60, 30)[house % 3] for house in range(1, 13)}
+
+# Natonnata day houses (Sun above the horizon)
+DAY_HOUSES = frozenset({7, 8, 9, 10, 11, 12})
+
+# Drik Bala: aspecting planets that add (rather than subtract) strength
+BENEFIC_ASPECTORS = frozenset({'Moon', 'Mercury', 'Jupiter', 'Venus'})
+DRIK_EXCLUDED = frozenset({'rahu', 'ketu', 'ascendant'})
+
+# Vishesha Drishti: full (60) aspect arcs
+# Mars 4th (90) and 8th (210), Jupiter 5th (120) and 9th (240), Saturn 3rd (60) and 10th (270)
+SPECIAL_ASPECT_ARCS = {
+    'mars': ((80, 100), (200, 220)),
+    'jupiter': ((110, 130), (230, 250)),
+    'saturn': ((50, 70), (260, 280)),
+}
+
 # ============================================================================
 # FRIENDSHIP CONSTANTS
 # ============================================================================
@@ -48,6 +114,19 @@ FRIENDSHIPS = {
     'Saturn': {'friends': ['Mercury', 'Venus'], 'neutral': ['Jupiter'], 'enemies': ['Sun', 'Moon', 'Mars']}
 }
 
+# Naisargika (natural) relationship as a score: friend +1, neutral 0, enemy -1
+NATURAL_SCORES = {
+    (planet, other): (1 if other in rel['friends'] else -1 if other in rel['enemies'] else 0)
+    for planet, rel in FRIENDSHIPS.items()
+    for other in FRIENDSHIPS
+}
+
+# Tatkalika (temporary) friends sit 2, 3, 4, 10, 11 or 12 signs from the planet
+TEMPORARY_FRIEND_OFFSETS = frozenset({1, 2, 3, 9, 10, 11})
+
+# Compound relationship label by (natural + temporary) score + 2
+COMPOUND_LABELS = ('Adhi Shatru', 'Shatru', 'Sama', 'Mitra', 'Adhi Mitra')
+
 def get_compound_relationship(planet: str, target_lord: str, chart: ChartResponse) -> str:
     """
     Calculate Panchadha Maitri (Compound Friendship).
@@ -58,104 +137,197 @@ def get_compound_relationship(planet: str, target_lord: str, chart: ChartRespons
     
     if p_name == l_name:
         return 'Own' # Own Sign handling
-        
+    
+    return _compound_label(p_name, l_name, _d1_signs(chart))
+
+def _d1_signs(chart: ChartResponse) -> Dict[str, int]:
+    """D1 sign_num of every chart body, keyed by capitalized name."""
+    return {key.capitalize(): data.sign_num for key, data in chart.planets.items()}
+
+def _compound_label(p_name: str, l_name: str, d1_signs: Dict[str, int]) -> str:
+    """Compound relationship of two distinct (capitalized) bodies."""
     # 1. Naisargika (Natural)
-    natural_rel = 'Neutral'
-    f_data = FRIENDSHIPS.get(p_name, {})
-    if l_name in f_data.get('friends', []):
-        natural_rel = 'Friend'
-    elif l_name in f_data.get('enemies', []):
-        natural_rel = 'Enemy'
+    score = NATURAL_SCORES.get((p_name, l_name), 0)
         
     # 2. Tatkalika (Temporary) - Based on D1 Positions
-    # Friend if in 2, 3, 4, 10, 11, 12 from Planet
-    temp_rel = 'Enemy'
-    
-    if p_name.lower() in chart.planets and l_name.lower() in chart.planets:
-        p_sign = chart.planets[p_name.lower()].sign_num
-        l_sign = chart.planets[l_name.lower()].sign_num
-        
-        # Count from P to L (inclusive? No, 2nd means next sign)
-        # Distance: (L - P) % 12 + 1 ?
-        # Example: P in 0. L in 1. Dist = 1-0 = 1? No 2nd House.
-        # House 1 is Same. House 2 is Next.
-        # Check diff:
-        diff = (l_sign - p_sign) % 12
-        # Houses: 2(1), 3(2), 4(3), 10(9), 11(10), 12(11)
-        # 0 is 1st (Same) - Enemy
-        if diff in [1, 2, 3, 9, 10, 11]:
-            temp_rel = 'Friend'
+    # Friend if in 2, 3, 4, 10, 11, 12 from Planet; otherwise (or unknown) Enemy
+    p_sign = d1_signs.get(p_name)
+    l_sign = d1_signs.get(l_name)
+    if p_sign is not None and l_sign is not None and \
+            (l_sign - p_sign) % 12 in TEMPORARY_FRIEND_OFFSETS:
+        score += 1
+    else:
+        score -= 1
             
     # 3. Compound Logic
-    # Friend + Friend = Adhi Mitra
-    # Friend + Neutral = Mitra
-    # Friend + Enemy = Sama
-    # Neutral + Friend = Mitra
-    # Neutral + Enemy = Shatru
-    # Enemy + Friend = Sama
-    # Enemy + Enemy = Adhi Shatru
-    
-    score = 0
-    if natural_rel == 'Friend': score += 1
-    elif natural_rel == 'Enemy': score -= 1
-    
-    if temp_rel == 'Friend': score += 1
-    else: score -= 1 # Enemy
-    
-    if score == 2: return 'Adhi Mitra'
-    if score == 1: return 'Mitra'
-    if score == 0: return 'Sama'
-    if score == -1: return 'Shatru'
-    return 'Adhi Shatru'
+    # Friend + Friend = Adhi Mitra, Friend + Neutral = Mitra, Friend + Enemy = Sama,
+    # Neutral + Enemy = Shatru, Enemy + Enemy = Adhi Shatru
+    return COMPOUND_LABELS[score + 2]
+
+def _varga_signs(planet: str, p_data: PlanetPosition, chart: ChartResponse) -> Tuple[int, ...]:
+    """Sign of the planet in each available Saptavarga chart (D1 falls back to p_data)."""
+    signs = []
+    planet_key = planet.lower()
+    vargas = chart.vargas
+    
+    for v_key in SAPTAVARGA_KEYS:
+        v_chart = vargas.get(v_key, {})
+        # Fallback to D1 if specific varga logic failed/missing?
+        # Ideally we skip or use D1. Using D1 for safety if missing.
+        # chart.vargas['d1_chart'] mimics standard varga structure; if it is
+        # missing, use the main planets info. Other missing vargas are skipped.
+        if not v_chart:
+            if v_key == 'd1_chart':
+               v_planet = p_data
+            else:
+               continue # Skip missing varga
+        else:
+            if planet_key not in v_chart and planet != 'Ascendant':
+                continue
+            v_planet = v_chart[planet_key]
+        
+        # VargaPlanet and PlanetPosition both declare sign_num
+        signs.append(v_planet.sign_num)
+    
+    return tuple(signs)
+
+class ShadbalaContext(NamedTuple):
+    """Per-chart quantities shared by every graha's Dig, Kala and Chesta Bala."""
+    sun_pos: float
+    moon_pos: float
+    asc_pos: float
+    angle_from_new: float   # Sun-Moon elongation folded to 0-180 (Paksha)
+    is_day: bool            # Sun above the horizon (Natonnata)
+    sun_ayana: float        # Sun's Ayana Bala, reused as its Chesta Bala
+    d1_signs: Dict[str, int]                    # Tatkalika (see _d1_signs)
+    varga_signs: Dict[str, Tuple[int, ...]]     # Saptavarga signs per graha key
+
+def _shadbala_context(chart: ChartResponse) -> ShadbalaContext:
+    sun = chart.planets.get('sun')
+    moon = chart.planets.get('moon')
+    sun_pos = sun.abs_pos if sun is not None else 0
+    moon_pos = moon.abs_pos if moon is not None else 0
+    
+    # Power Points (Houses treated as angles from Ascendant)
+    # Asc is at ChartMetadata... wait, we need Ascendant longitude.
+    # We can approximate from House 1 cusp if available, or just use House Logic
+    # BPHS uses Angle from specific points. 
+    # Let's use House placement as proxy if exact Ascendant degree missing?
+    # Better: Use chart.planets['ascendant'].abs_pos
+    asc_pos = 0.0
+    if 'ascendant' in chart.planets:
+        asc_pos = chart.planets['ascendant'].abs_pos
+    elif 'ascendant' in chart.vargas.get('D1', {}):
+         asc_pos = chart.vargas['D1']['ascendant'].abs_pos
+    
+    # Paksha: angle of the Moon from the Sun
+    angle = (moon_pos - sun_pos) % 360
+    angle_from_new = angle if angle <= 180 else 360 - angle
+    
+    # Natonnata: Houses 7-12 are above horizon (Day), 1-6 below (Night)
+    sun_house = sun.house if sun is not None else 1
+    
+    # Ayana for the Sun (North Declination Group)
+    sun_decl = sun.declination if sun is not None else 0.0
+    sun_ayana = max(0.0, min(24.0 + sun_decl, 48.0)) * 1.25
+    
+    # Saptavarga signs of all 7 grahas, gathered in one pass
+    varga_signs = {
+        key: _varga_signs(name, chart.planets[key], chart)
+        for name, key, _ in GRAHAS if key in chart.planets
+    }
+    
+    return ShadbalaContext(sun_pos, moon_pos, asc_pos, angle_from_new,
+                           sun_house in DAY_HOUSES, sun_ayana,
+                           _d1_signs(chart), varga_signs)
+
+
+# Shadbala fingerprint -> results; re-requested charts are new objects with equal inputs
+SHADBALA_CACHE_SIZE = 256
+_shadbala_cache: Dict[tuple, Dict[str, float]] = {}
+
+def _shadbala_fingerprint(chart: ChartResponse) -> tuple:
+    """Every chart input Shadbala reads: D1 positions/motion and Saptavarga signs."""
+    planets = chart.planets
+    fingerprint = (
+        tuple(
+            (key, p.abs_pos, p.degree, p.sign_num, p.house, p.speed, p.declination)
+            for key, p in planets.items()
+        ),
+        tuple(
+            _varga_signs(name, planets[key], chart)
+            for name, key, _ in GRAHAS if key in planets
+        ),
+    )
+    if 'ascendant' not in planets and 'ascendant' in chart.vargas.get('D1', {}):
+        fingerprint += (chart.vargas['D1']['ascendant'].abs_pos,)
+    return fingerprint
 
 def calculate_shadbala_for_chart(chart: ChartResponse) -> Dict[str, float]:
     """
     Main entry point for Shadbala calculation.
     Returns dictionary of {PlanetName: TotalShadbalaVirupas}
+    
+    Results are memoized on an exact fingerprint of the inputs, so a chart
+    regenerated for the same birth data is a cache hit.
     """
+    fingerprint = _shadbala_fingerprint(chart)
+    results = _shadbala_cache.get(fingerprint)
+    if results is None:
+        results = _calculate_shadbala(chart)
+        if len(_shadbala_cache) >= SHADBALA_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            _shadbala_cache.pop(next(iter(_shadbala_cache)), None)
+        _shadbala_cache[fingerprint] = results
+    # Callers get a fresh dict so edits never leak into the cache
+    return dict(results)
+
+def _calculate_shadbala(chart: ChartResponse) -> Dict[str, float]:
+    """Uncached body of calculate_shadbala_for_chart."""
     results = {}
+    drik_scores = calculate_drik_bala_all(chart)
+    ctx = _shadbala_context(chart)
     
     # We iterate over the 7 grahas
-    grahas = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn']
-    
-    for planet in grahas:
-        if planet.lower() not in chart.planets:
+    for planet, key, planet_id in GRAHAS:
+        p_data = chart.planets.get(key)
+        if p_data is None:
             continue
-            
-        p_data = chart.planets[planet.lower()]
+        
         total_virupas = 0.0
         
         # 1. Sthana Bala
-        total_virupas += calculate_sthana_bala(planet, p_data, chart)
+        total_virupas += calculate_sthana_bala(planet, p_data, chart, ctx)
         
         # 2. Dig Bala
-        total_virupas += calculate_dig_bala(planet, p_data, chart)
+        total_virupas += calculate_dig_bala(planet, p_data, chart, ctx)
         
         # 3. Kala Bala (Simplified for MVP, expanding later)
         # Including Natonnata, Paksha, Tribhaga, Ayana
-        total_virupas += calculate_kala_bala(planet, p_data, chart)
+        total_virupas += calculate_kala_bala(planet, p_data, chart, ctx)
         
         # 4. Chesta Bala
-        total_virupas += calculate_chesta_bala(planet, p_data, chart)
+        total_virupas += calculate_chesta_bala(planet, p_data, chart, ctx)
         
         # 5. Naisargika Bala
-        total_virupas += NAISARGIKA_BALA.get(planet, 0.0)
+        total_virupas += NAISARGIKA_BY_ID[planet_id]
         
         # 6. Drik Bala
-        total_virupas += calculate_drik_bala(planet, p_data, chart)
+        total_virupas += drik_scores[key]
         
         results[planet] = round(total_virupas, 2)
         
     return results
 
-def calculate_sthana_bala(planet: str, p_data: PlanetPosition, chart: ChartResponse) -> float:
+def calculate_sthana_bala(planet: str, p_data: PlanetPosition, chart: ChartResponse,
+                          ctx: Optional[ShadbalaContext] = None) -> float:
     score = 0.0
+    flags = PLANET_FLAGS.get(planet, NO_FLAGS)
     
     # A. Uccha Bala (Exaltation)
-    exalt_pt = EXALTATION_POINTS.get(planet, 0)
     abs_pos = p_data.abs_pos
-    # Distance to deep debilitation (Exaltation + 180)
-    debilitation_pt = (exalt_pt + 180) % 360
+    # Distance to deep debilitation (Exaltation + 180; unknown planets use 0 + 180)
+    debilitation_pt = DEBILITATION_POINTS.get(planet, 180)
     
     # Arc distance from debilitation
     diff = abs(abs_pos - debilitation_pt)
@@ -170,51 +342,30 @@ def calculate_sthana_bala(planet: str, p_data: PlanetPosition, chart: ChartRespo
     # Charts: D1, D2, D3, D7, D9, D12, D30
     # Points: Own=30, Adhi Mitra=22.5, Mitra=15, Sama=7.5, Shatru=3.75, Adhi Shatru=1.875
     
-    varga_keys = ['d1_chart', 'd2_chart', 'd3_chart', 'd7_chart', 'd9_chart', 'd12_chart', 'd30_chart']
     saptavarga_score = 0.0
+    if ctx is not None:
+        d1_signs = ctx.d1_signs
+        varga_signs = ctx.varga_signs.get(planet.lower())
+    else:
+        d1_signs = _d1_signs(chart)
+        varga_signs = None
+    if varga_signs is None:
+        varga_signs = _varga_signs(planet, p_data, chart)
     
-    points_map = {
-        'Own': 30.0,
-        'Adhi Mitra': 22.5,
-        'Mitra': 15.0,
-        'Sama': 7.5,
-        'Shatru': 3.75,
-        'Adhi Shatru': 1.875
-    }
+    # Relationship points per varga sign lord (lords repeat across vargas)
+    # Must use D1 chart for Tatkalika logic
+    p_name = planet.capitalize()
+    lord_points: Dict[str, float] = {}
     
-    for v_key in varga_keys:
-        v_chart = chart.vargas.get(v_key, {})
-        # Fallback to D1 if specific varga logic failed/missing?
-        # Ideally we skip or use D1. Using D1 for safety if missing.
-        if not v_chart and v_key == 'd1_chart':
-             # Should be available in chart.planets for D1? 
-             # chart.planets is simplified format. chart.vargas['d1_chart'] mimics standard varga structure.
-             # If chart.vargas['d1_chart'] missing, construct it from chart.planets?
-             # For robustness, we assume vargas populated. If not, 0 points? Or Average (7.5)?
-             pass
-             
-        if not v_chart:
-            # Try to get from planetary position if D1
-            if v_key == 'd1_chart':
-               # Use main planets info
-               v_planet = p_data
-            else:
-               continue # Skip missing varga
-        else:
-            if planet.lower() not in v_chart and planet != 'Ascendant':
-                continue
-            v_planet = v_chart[planet.lower()]
-            
-        # Get Sign Lord
-        # v_planet usually has 'sign_num'
-        s_num = getattr(v_planet, 'sign_num', 0)
+    for s_num in varga_signs:
         lord = SIGN_LORDS.get(s_num, 'Mars') # Default to Mars/Aries if fails
         
-        # Calculate Relationship
-        # Must use D1 chart for Tatkalika logic inside helper
-        rel = get_compound_relationship(planet, lord, chart)
+        points = lord_points.get(lord)
+        if points is None:
+            rel = 'Own' if lord == p_name else _compound_label(p_name, lord, d1_signs)
+            points = lord_points[lord] = SAPTAVARGA_POINTS.get(rel, 7.5)
         
-        saptavarga_score += points_map.get(rel, 7.5)
+        saptavarga_score += points
         
     score += saptavarga_score
     
@@ -223,11 +374,8 @@ def calculate_sthana_bala(planet: str, p_data: PlanetPosition, chart: ChartRespo
     is_odd = (p_data.sign_num % 2 == 0) # sign_num 0 is Aries (Odd)
     # Even signs: Taurus(1), Cancer(3), Virgo(5), Scorp(7), Cap(9), Pisces(11)
     
-    # Moon/Venus strong in Even
-    if planet in ['Moon', 'Venus'] and not is_odd:
-        score += 15
-    # Sun/Mars/Jup/Merc/Sat strong in Odd
-    elif planet in ['Sun', 'Mars', 'Jupiter', 'Mercury', 'Saturn'] and is_odd:
+    # Moon/Venus strong in Even, Sun/Mars/Jup/Merc/Sat strong in Odd
+    if flags.oja_odd == is_odd:
         score += 15
         
     # D. Kendradi Bala
@@ -235,41 +383,21 @@ def calculate_sthana_bala(planet: str, p_data: PlanetPosition, chart: ChartRespo
     # 2/5/8/11 = Panapara = 30
     # 3/6/9/12 = Apoklima = 15
     # House should be obtained from p_data.house derived from Ascendant
-    house = p_data.house
-    if house in [1, 4, 7, 10]:
-        score += 60
-    elif house in [2, 5, 8, 11]:
-        score += 30
-    else:
-        score += 15
+    score += KENDRADI_POINTS.get(p_data.house, 15)
         
     # E. Drekkana Bala (Simplified: Male planets in 1st decanate etc)
     # Sun/Mars/Jup (Male) -> 1st Decanate
     # Ven/Moon (Female) -> 2nd Decanate
     # Mer/Sat (Neutral) -> 3rd Decanate
     decanate = int((p_data.degree % 30) / 10) + 1
-    if planet in ['Sun', 'Mars', 'Jupiter'] and decanate == 1:
-        score += 15
-    elif planet in ['Venus', 'Moon'] and decanate == 2:
-        score += 15
-    elif planet in ['Mercury', 'Saturn'] and decanate == 3:
+    if flags.decanate == decanate:
         score += 15
         
     return score
 
-def calculate_dig_bala(planet: str, p_data: PlanetPosition, chart: ChartResponse) -> float:
-    # Power Points (Houses treated as angles from Ascendant)
-    # Asc is at ChartMetadata... wait, we need Ascendant longitude.
-    # We can approximate from House 1 cusp if available, or just use House Logic
-    # BPHS uses Angle from specific points. 
-    # Let's use House placement as proxy if exact Ascendant degree missing?
-    # Better: Use chart.planets['ascendant'].abs_pos
-    
-    asc_pos = 0.0
-    if 'ascendant' in chart.planets:
-        asc_pos = chart.planets['ascendant'].abs_pos
-    elif 'ascendant' in chart.vargas.get('D1', {}):
-         asc_pos = chart.vargas['D1']['ascendant'].abs_pos
+def calculate_dig_bala(planet: str, p_data: PlanetPosition, chart: ChartResponse,
+                       ctx: Optional[ShadbalaContext] = None) -> float:
+    asc_pos = (ctx or _shadbala_context(chart)).asc_pos
     
     # Calculate angular distance from powerful point
     # Sun/Mars: 10th House (Asc - 90 approx, or Asc + 270) -> South / Meridian
@@ -280,13 +408,10 @@ def calculate_dig_bala(planet: str, p_data: PlanetPosition, chart: ChartResponse
     p_pos = p_data.abs_pos
     power_point = 0.0
     
-    if planet in ['Sun', 'Mars']:
-        power_point = (asc_pos + 270) % 360 # MC approx
-    elif planet in ['Moon', 'Venus']:
-        power_point = (asc_pos + 90) % 360 # IC approx
-    elif planet == 'Saturn':
-        power_point = (asc_pos + 180) % 360 # Dsc
-    elif planet in ['Jupiter', 'Mercury']:
+    offset = PLANET_FLAGS.get(planet, NO_FLAGS).dig_offset
+    if offset:
+        power_point = (asc_pos + offset) % 360 # MC / IC / Dsc
+    elif offset == 0:
         power_point = asc_pos # Asc
         
     arc = abs(p_pos - power_point)
@@ -298,60 +423,49 @@ def calculate_dig_bala(planet: str, p_data: PlanetPosition, chart: ChartResponse
     # If planet is opp power point (arc=180), score = 0.
     return (180 - arc) / 3.0
 
-def calculate_kala_bala(planet: str, p_data: PlanetPosition, chart: ChartResponse) -> float:
+def calculate_kala_bala(planet: str, p_data: PlanetPosition, chart: ChartResponse,
+                        ctx: Optional[ShadbalaContext] = None) -> float:
     """
     Calculate Kala Bala (Time Strength) with corrected Day/Night calculation.
     """
     score = 0.0
+    ctx = ctx or _shadbala_context(chart)
+    flags = PLANET_FLAGS.get(planet, NO_FLAGS)
     
     # --- 1. Paksha Bala (Lunar Phase) ---
-    sun_pos = chart.planets['sun'].abs_pos if 'sun' in chart.planets else 0
-    moon_pos = chart.planets['moon'].abs_pos if 'moon' in chart.planets else 0
-    angle = (moon_pos - sun_pos) % 360
-    
-    angle_from_new = angle if angle <= 180 else 360 - angle
+    angle_from_new = ctx.angle_from_new
     
     # Benefics get strength from Full Moon (180 deg)
     # Malefics get strength from New Moon (0 deg)
     paksha_score = 0.0
-    if planet in ['Jupiter', 'Venus', 'Moon', 'Mercury']:
+    if flags.paksha_benefic:
         paksha_score = (angle_from_new / 180.0) * 60
     else:
         paksha_score = ((180 - angle_from_new) / 180.0) * 60
     score += paksha_score
     
     # --- 2. Natonnata Bala (Day/Night) ---
-    # Determine Day vs Night based on Sun's House
-    # Houses 7-12 are above horizon (Day), 1-6 below (Night)
-    sun_house = chart.planets['sun'].house if 'sun' in chart.planets else 1
-    is_day = sun_house in [7, 8, 9, 10, 11, 12]
+    # Determine Day vs Night based on Sun's House (see _shadbala_context)
+    is_day = ctx.is_day
     
+    # Day Strong: Sun, Jupiter, Venus (Male/Day planets)
+    # Night Strong: Moon, Mars, Saturn
+    # Mercury is strong always (Day & Night) or at Sandhya
     natonnata_score = 0.0
-    if is_day:
-        # Day Strong: Sun, Jupiter, Venus (Male/Day planets)
-        if planet in ['Sun', 'Jupiter', 'Venus']:
-            natonnata_score = 60.0
-        # Mercury is strong always (Day & Night) or at Sandhya
-        elif planet == 'Mercury':
-            natonnata_score = 60.0
-    else:
-        # Night Strong: Moon, Mars, Saturn
-        if planet in ['Moon', 'Mars', 'Saturn']:
-            natonnata_score = 60.0
-        elif planet == 'Mercury':
-            natonnata_score = 60.0
+    if flags.day_strong if is_day else flags.night_strong:
+        natonnata_score = 60.0
             
     score += natonnata_score
     
     # --- 3. Ayana Bala (Equinoctial) ---
-    declination = getattr(p_data, 'declination', 0.0)
+    declination = p_data.declination
     val = 0.0
     
-    # North Declination Group: Sun, Mars, Jupiter, Venus
-    if planet in ['Sun', 'Mars', 'Jupiter', 'Venus', 'Mercury']:
+    # North Declination Group: Sun, Mars, Jupiter, Venus, Mercury
+    if flags.ayana_sign > 0:
         val = 24.0 + declination # Declination is +/-
     # South Declination Group: Moon, Saturn
-    elif planet in ['Moon', 'Saturn']:
+    elif flags.ayana_sign < 0:
         val = 24.0 - declination
         
     val = max(0.0, min(val, 48.0))
@@ -360,29 +474,32 @@ def calculate_kala_bala(planet: str, p_data: PlanetPosition, chart: ChartRespons
     
     return score
 
-def calculate_chesta_bala(planet: str, p_data: PlanetPosition, chart: ChartResponse) -> float:
+def calculate_chesta_bala(planet: str, p_data: PlanetPosition, chart: ChartResponse,
+                          ctx: Optional[ShadbalaContext] = None) -> float:
     """
     Calculate Chesta Bala (Motional Strength) with corrected Sun/Moon handling.
     """
     # 1. Sun & Moon Special Case
     if planet == 'Sun':
-        # Sun Chesta = Sun Ayana Bala (Recalculate or store/pass it)
-        # For efficiency here, we approximate using Declination again or call helper
-        decl = getattr(p_data, 'declination', 0.0)
+        # Sun Chesta = Sun Ayana Bala (precomputed in the chart context)
+        if ctx is not None:
+            return ctx.sun_ayana
+        decl = p_data.declination
         val = max(0.0, min(24.0 + decl, 48.0))
         return val * 1.25
         
     if planet == 'Moon':
         # Moon Chesta = Moon Paksha Bala
-        # Check angle from Sun again
-        sun_pos = chart.planets['sun'].abs_pos if 'sun' in chart.planets else 0
+        if ctx is not None:
+            return (ctx.angle_from_new / 180.0) * 60
+        sun_pos = _shadbala_context(chart).sun_pos
         moon_pos = p_data.abs_pos
         angle = (moon_pos - sun_pos) % 360
         angle_from_new = angle if angle <= 180 else 360 - angle
         return (angle_from_new / 180.0) * 60
 
     # 2. Other Planets (Based on Speed)
-    speed = getattr(p_data, 'speed', 0.0)
+    speed = p_data.speed
     
     if speed < 0:
         return 60.0 # Vakra (Retrograde)
@@ -393,67 +510,69 @@ def calculate_chesta_bala(planet: str, p_data: PlanetPosition, chart: ChartRespo
     # For MVP, Direct motion = 30 is acceptable
     return 30.0
 
-def calculate_drik_bala(planet: str, p_data: PlanetPosition, chart: ChartResponse) -> float:
-    """
-    Corrected Aspect Calculation checking Special Aspects properly.
-    """
+def _drik_aspectors(chart: ChartResponse) -> List[tuple]:
+    """(key, abs_pos, is_benefic, special arcs) for each planet that can aspect."""
+    return [
+        (key, data.abs_pos, key.capitalize() in BENEFIC_ASPECTORS, SPECIAL_ASPECT_ARCS.get(key, ()))
+        for key, data in chart.planets.items() if key not in DRIK_EXCLUDED
+    ]
+
+def _drik_score(planet_key: str, target_pos: float, aspectors: List[tuple]) -> float:
     score = 0.0
-    target_pos = p_data.abs_pos
-    
-    is_benefic_aspect = {
-        'Sun': False, 'Moon': True, 'Mars': False, 'Mercury': True,
-        'Jupiter': True, 'Venus': True, 'Saturn': False
-    }
     
-    for other_p, other_data in chart.planets.items():
-        if other_p == planet.lower() or other_p in ['rahu', 'ketu', 'ascendant']:
+    for other_p, aspecting_pos, is_benefic, special_arcs in aspectors:
+        if other_p == planet_key:
             continue
             
-        aspecting_pos = other_data.abs_pos
         angle = (target_pos - aspecting_pos) % 360
+        # No aspect (generic or special) within 30 degrees
+        if angle < 30:
+            continue
         
-        # 1. Calculate Base (Generic) Aspect
-        drishti_val = get_drishti_value(angle)
+        # 1. Calculate Base (Generic) Aspect; none beyond 180
+        drishti_val = get_drishti_value(angle) if angle <= 180 else 0.0
         
         # 2. Handle Special Aspects (Vishesha Drishti)
         # We take the MAX of Generic vs Special to ensure full strength is applied.
+        # Using simple proximity logic for MVP (see SPECIAL_ASPECT_ARCS)
+        for low, high in special_arcs:
+            if low <= angle <= high:
+                drishti_val = 60.0
+                break
         
-        if other_p == 'mars':
-            # Mars Full Aspect (60) on 4th (90-120 range) and 8th (210 range)
-            # Using simple proximity logic for MVP
-            if 80 <= angle <= 100: 
-                drishti_val = max(drishti_val, 60.0) # 4th House
-            if 200 <= angle <= 220:
-                drishti_val = max(drishti_val, 60.0) # 8th House
-
-        elif other_p == 'jupiter':
-            # Jupiter Full Aspect (60) on 5th (120) and 9th (240)
-            if 110 <= angle <= 130: 
-                drishti_val = max(drishti_val, 60.0)
-            if 230 <= angle <= 250:
-                drishti_val = max(drishti_val, 60.0)
-
-        elif other_p == 'saturn':
-            # Saturn Full Aspect (60) on 3rd (60) and 10th (270)
-            if 50 <= angle <= 70:
-                drishti_val = max(drishti_val, 60.0)
-            if 260 <= angle <= 280:
-                drishti_val = max(drishti_val, 60.0)
+        if not drishti_val:
+            continue
 
         # Cap at 60 (Standard Max)
         drishti_val = min(drishti_val, 60.0)
         
         # 3. Apply Benefic/Malefic Modifier
         modifier = drishti_val / 4.0
-        p_name_cap = other_p.capitalize()
         
-        if is_benefic_aspect.get(p_name_cap, False):
+        if is_benefic:
             score += modifier
         else:
             score -= modifier
                 
     return score
 
+def calculate_drik_bala(planet: str, p_data: PlanetPosition, chart: ChartResponse) -> float:
+    """
+    Corrected Aspect Calculation checking Special Aspects properly.
+    """
+    return _drik_score(planet.lower(), p_data.abs_pos, _drik_aspectors(chart))
+
+def calculate_drik_bala_all(chart: ChartResponse) -> Dict[str, float]:
+    """
+    Drik Bala for every graha in the chart (keyed by lowercase name), resolving
+    the aspecting planets once per chart instead of once per graha.
+    """
+    aspectors = _drik_aspectors(chart)
+    return {
+        key: _drik_score(key, chart.planets[key].abs_pos, aspectors)
+        for _, key, _ in GRAHAS if key in chart.planets
+    }
+
 def get_drishti_value(angle: float) -> float:
     """
     BPHS Quadratic/Linear Aspect Formulas (Continuous).
@@ -520,3 +639,15 @@ def get_drishti_value(angle: float) -> float:
     # Special aspects like 270 (Mars/Saturn) need to be handled separately.
     # General aspect ends at 180.
     return 0.0
+
+def get_drishti_values(angles: np.ndarray) -> np.ndarray:
+    """
+    Vectorized get_drishti_value for an array of angles (same piecewise formulas).
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    return np.select(
+        [angles < 30, angles <= 60, angles <= 90, angles <= 120, angles <= 150, angles <= 180],
+        [0.0, (angles - 30) / 2.0, (angles - 60) + 15.0, 45.0 - (angles - 90) / 2.0,
+         150.0 - angles, (angles - 150) * 2.0],
+        0.0
+    )
@@ -1,5 +1,7 @@
 
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import hashlib
 import numpy as np
 import os
 from backend.logger import logger
@@ -46,31 +48,35 @@ def create_shadbala_plots(chart: ChartResponse, output_dir: str, shadbala_data:
         # Green if strong, Red if weak
         colors.append('#2ecc71' if val >= req else '#e74c3c')
 
-    timestamp = int(os.path.getmtime(output_dir) if os.path.exists(output_dir) else 0)
-    # Use random hash or timestamp to avoid cache collision? Logic in app calls this uniquely?
-    # App passes output_dir. We should generate unique filename.
-    # Actually app.py handles cleanup.
+    # Deterministic per-chart key: same name + strengths -> same file, while two
+    # different charts sharing a name no longer overwrite each other.
+    # app.py handles cleanup of output_dir.
+    name = chart.metadata.name.replace(' ', '_')
+    key = hashlib.blake2b(f"{name}:{tuple(values)}".encode(), digest_size=4).hexdigest()
     
-    bar_path = os.path.join(output_dir, f"shadbala_bar_{chart.metadata.name.replace(' ', '_')}.png")
-    radar_path = os.path.join(output_dir, f"shadbala_radar_{chart.metadata.name.replace(' ', '_')}.png")
+    bar_path = os.path.join(output_dir, f"shadbala_bar_{name}_{key}.png")
+    radar_path = os.path.join(output_dir, f"shadbala_radar_{name}_{key}.png")
     
     # 1. Bar Chart
-    plt.figure(figsize=(10, 6))
-    bars = plt.bar(labels, values, color=colors)
-    plt.axhline(y=350, color='gray', linestyle='--', alpha=0.5, label='Avg Requirement') # Approx
+    # Object API on an Agg canvas: no pyplot state machine or interactive backend,
+    # and safe from app.py's worker threads (a shared figure would not be)
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    bars = ax.bar(labels, values, color=colors)
+    ax.axhline(y=350, color='gray', linestyle='--', alpha=0.5, label='Avg Requirement') # Approx
     
     # Add Minimum Required Markers
     for i, p in enumerate(labels):
         req = min_reqs[p]
-        plt.hlines(y=req, xmin=i-0.4, xmax=i+0.4, colors='black', linestyles='solid', linewidth=2)
-        plt.text(i, values[i] + 10, f"{int(values[i])}", ha='center')
+        ax.hlines(y=req, xmin=i-0.4, xmax=i+0.4, colors='black', linestyles='solid', linewidth=2)
+        ax.text(i, values[i] + 10, f"{int(values[i])}", ha='center')
     
-    plt.title("Shadbala Strength (Virupas)")
-    plt.ylabel("Strength")
-    plt.grid(axis='y', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(bar_path)
-    plt.close()
+    ax.set_title("Shadbala Strength (Virupas)")
+    ax.set_ylabel("Strength")
+    ax.grid(axis='y', alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(bar_path)
     
     # 2. Radar Chart (Optional - Standardizing range 0 to 600)
     # ... Simplified for now to just Bar Chart as primary.
@@ -1,11 +1,11 @@
-from typing import Dict
-import math
+from typing import Dict, List, NamedTuple, Optional, Union
+import numpy as np
 from backend.logger import logger
 
-ZODIAC_SIGNS = [
+ZODIAC_SIGNS = (
     "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
     "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-]
+)
 
 # Standard Vedic Varga Divisors
 STANDARD_DIVISORS = {1, 2, 3, 4, 7, 9, 10, 12, 16, 20, 24, 27, 30, 40, 45, 60}
@@ -20,16 +20,185 @@ DEGREE_PRECISION = 4
 NINTH_SIGN_OFFSET = 8  # 9th sign is 8 steps ahead
 FIFTH_SIGN_OFFSET = 4  # 5th sign is 4 steps ahead
 
+def _by_parity(odd: int, even: int) -> np.ndarray:
+    """Start sign per sign_num for Vedic odd (even index) / even (odd index) signs."""
+    return np.array([odd if s % 2 == 0 else even for s in range(12)])
+
+def _by_modality(movable: int, fixed: int, dual: int) -> np.ndarray:
+    """Start sign per sign_num for movable / fixed / dual signs."""
+    return np.array([
+        movable if s in MOVABLE_SIGNS else fixed if s in FIXED_SIGNS else dual
+        for s in range(12)
+    ])
+
+SAME_SIGN = np.arange(12)
+
+# calculate_varga start_rule -> starting sign per sign_num
+START_RULES = {
+    'same': SAME_SIGN,
+    # 6. ODD_EVEN RULE COMMENT CLARITY
+    # Vedic odd signs (1,3,5...) have even indices (0,2,4...)
+    # Vedic even signs (2,4,6...) have odd indices (1,3,5...)
+    'odd_even': np.array([s if s % 2 == 0 else (s + NINTH_SIGN_OFFSET) % 12 for s in range(12)]),
+    # Odd: same, Even: 7th
+    'odd_even_d7': np.array([s if s % 2 == 0 else (s + 6) % 12 for s in range(12)]),
+    # 7. MOVABLE/FIXED/DUAL GROUPING (10. OFFSET CONSTANTS)
+    'movable_fixed_dual': np.array([
+        s if s in MOVABLE_SIGNS
+        else (s + NINTH_SIGN_OFFSET) % 12 if s in FIXED_SIGNS
+        else (s + FIFTH_SIGN_OFFSET) % 12
+        for s in range(12)
+    ]),
+}
+
+# Fixed-formula vargas: divisor -> (start sign per sign_num, signs advanced per division)
+FIXED_VARGAS = {
+    3: (SAME_SIGN, 4),                              # D3: 1, 5, 9 from same sign
+    4: (SAME_SIGN, 3),                              # D4: 1, 4, 7, 10
+    7: (START_RULES['odd_even_d7'], 1),             # D7: Odd from same, Even from 7th
+    8: (_by_modality(0, 8, 4), 1),                  # D8: Movable Aries, Fixed Sagittarius, Dual Leo
+    16: (_by_modality(0, 4, 8), 1),                 # D16: Movable Aries, Fixed Leo, Dual Sagittarius
+    20: (_by_modality(0, 8, 4), 1),                 # D20: Movable Aries, Fixed Sagittarius, Dual Leo
+    24: (_by_parity(4, 3), 1),                      # D24: Odd Leo, Even Cancer
+    # D27: Fire(0,4,8) Aries, Earth(1,5,9) Capricorn, Air(2,6,10) Libra, Water(3,7,11) Cancer
+    27: (np.array([(0, 9, 6, 3)[s % 4] for s in range(12)]), 1),
+    40: (_by_parity(0, 6), 1),                      # D40: Odd Aries, Even Libra
+    45: (_by_modality(0, 4, 8), 1),                 # D45: Movable Aries, Fixed Leo, Dual Sagittarius
+    60: (SAME_SIGN, 1),                             # D60: counts from same sign
+}
+
+def _sign_table(start_signs: np.ndarray, step: int, divisor: int) -> np.ndarray:
+    """Varga sign for every (sign_num, division index): shape (12, divisor)."""
+    return (start_signs[:, None] + np.arange(divisor) * step) % 12
+
+def _build_varga_tables() -> Dict:
+    """Sign tables for the fixed vargas (by divisor) and calculate_varga's (divisor, rule) uses."""
+    tables = {
+        divisor: _sign_table(start_signs, step, divisor)
+        for divisor, (start_signs, step) in FIXED_VARGAS.items()
+    }
+    for divisor, rule in ((5, 'odd_even'), (6, 'odd_even'), (7, 'odd_even_d7'), (9, 'movable_fixed_dual'),
+                          (10, 'odd_even'), (11, 'same'), (12, 'same')):
+        tables[(divisor, rule)] = _sign_table(START_RULES[rule], 1, divisor)
+    return tables
+
+VARGA_TABLES = _build_varga_tables()
+
+# All fixed vargas side by side, for computing them in one pass (_fixed_vargas)
+FIXED_DIVISORS = np.array(list(FIXED_VARGAS))
+FIXED_DIV_SIZES = 30.0 / FIXED_DIVISORS
+FIXED_TABLE = np.stack([  # (varga, sign_num, division), padded to the largest divisor
+    np.pad(VARGA_TABLES[divisor], ((0, 0), (0, FIXED_DIVISORS.max() - divisor)))
+    for divisor in FIXED_VARGAS
+])
+
+class PlanetArrays(NamedTuple):
+    """Chart entries as parallel arrays, built once per chart by _chart_to_soa."""
+    names: List[str]             # chart keys ('sun', 'moon', ...)
+    display_names: List[str]     # planet_data['name']
+    sign_num: np.ndarray         # int64
+    degree: np.ndarray           # float64
+    has_abs_pos: np.ndarray      # bool: rows the fixed-formula vargas accept
+
+def _chart_to_soa(chart_data: Union[Dict, PlanetArrays]) -> PlanetArrays:
+    """Collect every usable chart entry (skipping _metadata/malformed) in one pass."""
+    if isinstance(chart_data, PlanetArrays):
+        return chart_data
+    
+    names, display_names, signs, degrees, has_abs_pos = [], [], [], [], []
+    for planet_name, planet_data in chart_data.items():
+        if planet_name == '_metadata' or not isinstance(planet_data, dict):
+            continue
+        if 'sign_num' not in planet_data or 'degree' not in planet_data:
+            continue
+        names.append(planet_name)
+        display_names.append(planet_data['name'])
+        signs.append(planet_data['sign_num'])
+        degrees.append(planet_data['degree'])
+        has_abs_pos.append('abs_pos' in planet_data)
+    
+    return PlanetArrays(
+        names, display_names,
+        np.array(signs, dtype=np.int64), np.array(degrees, dtype=np.float64),
+        np.array(has_abs_pos, dtype=bool)
+    )
+
+def _select(soa: PlanetArrays, mask: np.ndarray) -> PlanetArrays:
+    """Rows of soa where mask is set."""
+    if mask.all():
+        return soa
+    keep = np.flatnonzero(mask).tolist()
+    return PlanetArrays(
+        [soa.names[i] for i in keep], [soa.display_names[i] for i in keep],
+        soa.sign_num[mask], soa.degree[mask], soa.has_abs_pos[mask]
+    )
+
+def _varga_dict(soa: PlanetArrays, signs: np.ndarray, degrees: np.ndarray,
+                abs_pos: np.ndarray, precision: int) -> Dict:
+    """Rebuild the per-planet varga dicts from result arrays."""
+    return {
+        planet_name: {
+            'name': display_name,
+            'sign': ZODIAC_SIGNS[sign],
+            'sign_num': sign,
+            'degree': round(degree, precision),
+            'abs_pos': longitude
+        }
+        for planet_name, display_name, sign, degree, longitude in zip(
+            soa.names, soa.display_names, signs.tolist(), degrees.tolist(), abs_pos.tolist()
+        )
+    }
+
+def _fixed_varga(chart_data: Union[Dict, PlanetArrays], divisor: int) -> Dict:
+    """
+    Divisional chart with equal divisions counted from a start sign per sign_num
+    (see FIXED_VARGAS), degree scaled to the full 30.
+    """
+    soa = _chart_to_soa(chart_data)
+    soa = _select(soa, soa.has_abs_pos)
+    div_size = 30.0 / divisor
+    signs = soa.sign_num % 12
+    
+    div_idx = np.trunc(soa.degree / div_size).astype(np.int64)
+    if ((div_idx >= 0) & (div_idx < divisor)).all():
+        v_signs = VARGA_TABLES[divisor][signs, div_idx]
+    else:
+        # Degrees outside [0, 30) are not validated here; count past the table
+        start_signs, step = FIXED_VARGAS[divisor]
+        v_signs = (start_signs[signs] + div_idx * step) % 12
+    # Scale by divisor: equals 30 / div_size exactly for every FIXED_VARGAS divisor
+    v_degrees = (soa.degree % div_size) * divisor
+    
+    return _varga_dict(soa, v_signs, v_degrees, v_signs * 30 + v_degrees, 2)
+
+def _fixed_vargas(soa: PlanetArrays) -> Dict[int, Dict]:
+    """Every FIXED_VARGAS chart from one set of (planet, varga) array operations."""
+    soa = _select(soa, soa.has_abs_pos)
+    degree = soa.degree[:, None]
+    
+    div_idx = np.trunc(degree / FIXED_DIV_SIZES).astype(np.int64)
+    if not ((div_idx >= 0) & (div_idx < FIXED_DIVISORS)).all():
+        return {divisor: _fixed_varga(soa, divisor) for divisor in FIXED_VARGAS}
+    v_signs = FIXED_TABLE[np.arange(len(FIXED_VARGAS)), (soa.sign_num % 12)[:, None], div_idx]
+    v_degrees = (degree % FIXED_DIV_SIZES) * FIXED_DIVISORS
+    v_longitudes = v_signs * 30 + v_degrees
+    
+    return {
+        divisor: _varga_dict(soa, v_signs[:, j], v_degrees[:, j], v_longitudes[:, j], 2)
+        for j, divisor in enumerate(FIXED_VARGAS)
+    }
+
 def get_varga_sign(longitude: float) -> int:
     """Helper to get sign number from longitude (0-11)"""
     return int(longitude / 30) % 12
 
-def calculate_varga(chart_data: Dict, divisor: int, start_rule: str) -> Dict:
+def calculate_varga(chart_data: Union[Dict, PlanetArrays], divisor: int, start_rule: str) -> Dict:
     """
     Calculate varga chart with proper boundary handling and precision.
     
     Args:
-        chart_data: Dictionary containing planetary positions (sign_num, degree).
+        chart_data: Dictionary containing planetary positions (sign_num, degree),
+            or the PlanetArrays built from it by _chart_to_soa.
         divisor: The division number (e.g., 9 for Navamsa).
         start_rule: Rule to determine starting sign ('same', 'odd_even', 'movable_fixed_dual').
         
@@ -47,441 +216,188 @@ def calculate_varga(chart_data: Dict, divisor: int, start_rule: str) -> Dict:
         logger.error(f"Invalid divisor: {divisor}")
         return {}
     
-    VALID_RULES = {'same', 'odd_even', 'movable_fixed_dual', 'odd_even_d7'}
-    if start_rule not in VALID_RULES:
+    if start_rule not in START_RULES:
         logger.error(f"Invalid start_rule: {start_rule}")
         return {}
     
-    varga_chart = {}
+    soa = _chart_to_soa(chart_data)
     div_size = 30.0 / divisor
+    degree = soa.degree
+    sign_num = soa.sign_num
     
-    for planet_name, planet_data in chart_data.items():
-        if planet_name == '_metadata' or not isinstance(planet_data, dict):
-            continue
-            
-        if 'sign_num' not in planet_data or 'degree' not in planet_data:
-            continue
-            
-        sign_num = planet_data['sign_num']
-        degree = planet_data['degree']
-        
-        # 1. DEGREE VALIDATION BOUNDARY
-        # 30.0 should be treated as 0.0 of next sign, checking strictly < 30
-        if not (0 <= degree < 30):
-            logger.warning(f"{planet_name}: degree {degree} out of expected [0, 30) range")
-            degree = max(0.0, min(degree, 29.9999))
-            
-        if not (0 <= sign_num < 12):
-            logger.error(f"{planet_name}: sign_num {sign_num} out of range [0, 12)")
-            continue
-        
-        # 2. DIVISION INDEX CALCULATION
-        # Use math.floor for explicit integer conversion
-        division_index = math.floor(degree / div_size)
-        division_index = min(division_index, divisor - 1)  # Handle boundary
-        
-        # Calculate starting sign based on rule
-        if start_rule == 'same':
-            start_sign = sign_num
-        elif start_rule == 'odd_even':
-            # 6. ODD_EVEN RULE COMMENT CLARITY
-            # Vedic odd signs (1,3,5...) have even indices (0,2,4...)
-            # Vedic even signs (2,4,6...) have odd indices (1,3,5...)
-            start_sign = sign_num if (sign_num % 2 == 0) else (sign_num + NINTH_SIGN_OFFSET) % 12
-        elif start_rule == 'odd_even_d7':
-             # Odd: same, Even: 7th
-            start_sign = sign_num if (sign_num % 2 == 0) else (sign_num + 6) % 12
-        elif start_rule == 'movable_fixed_dual':
-            # 7. MOVABLE/FIXED/DUAL GROUPING
-            if sign_num in MOVABLE_SIGNS:
-                start_sign = sign_num
-            elif sign_num in FIXED_SIGNS:
-                # 10. OFFSET CONSTANTS
-                start_sign = (sign_num + NINTH_SIGN_OFFSET) % 12
-            else:  # Dual
-                start_sign = (sign_num + FIFTH_SIGN_OFFSET) % 12
-        
-        # 5. DIVISION ARITHMETIC SIMPLIFICATION
-        # (start_sign + (division_index + 1) - 1) simplifies to:
-        varga_sign_num = (start_sign + division_index) % 12
-        
-        # 3. DEGREE_IN_DIVISION SAFETY
-        degree_in_division = max(0.0, degree - (division_index * div_size))
-        
-        v_degree = (degree_in_division / div_size) * 30.0
-        
-        # 4. V_DEGREE CAPPING LOGIC
-        if v_degree >= 30.0:
-            logger.warning(f"{planet_name}: v_degree {v_degree} exceeded 30, capping")
-            v_degree = 29.9999
-        
-        v_longitude = varga_sign_num * 30 + v_degree
-        
-        varga_chart[planet_name] = {
-            'name': planet_data['name'],
-            'sign': ZODIAC_SIGNS[varga_sign_num],
-            'sign_num': varga_sign_num,
-            # 8. PRECISION CONSTANT
-            'degree': round(v_degree, DEGREE_PRECISION),
-            'abs_pos': round(v_longitude, DEGREE_PRECISION)
-        }
+    # 1. DEGREE VALIDATION BOUNDARY
+    # 30.0 should be treated as 0.0 of next sign, checking strictly < 30
+    out_of_range = ~((degree >= 0) & (degree < 30))
+    if out_of_range.any():
+        for i in np.flatnonzero(out_of_range).tolist():
+            logger.warning(f"{soa.names[i]}: degree {degree[i].item()} out of expected [0, 30) range")
+        degree = np.where(out_of_range, np.clip(degree, 0.0, 29.9999), degree)
+    
+    valid = (sign_num >= 0) & (sign_num < 12)
+    if not valid.all():
+        for i in np.flatnonzero(~valid).tolist():
+            logger.error(f"{soa.names[i]}: sign_num {sign_num[i].item()} out of range [0, 12)")
+        soa = _select(soa, valid)
+        degree, sign_num = degree[valid], soa.sign_num
+    
+    # 2. DIVISION INDEX CALCULATION
+    division_index = np.minimum(np.floor(degree / div_size), divisor - 1).astype(np.int64)  # Handle boundary
+    
+    # 5. DIVISION ARITHMETIC SIMPLIFICATION
+    # (start_sign + (division_index + 1) - 1) simplifies to:
+    table = VARGA_TABLES.get((divisor, start_rule))
+    if table is None:
+        table = VARGA_TABLES[(divisor, start_rule)] = _sign_table(START_RULES[start_rule], 1, divisor)
+    varga_sign_num = table[sign_num, division_index]
+    
+    # 3. DEGREE_IN_DIVISION SAFETY
+    degree_in_division = np.maximum(0.0, degree - (division_index * div_size))
+    
+    v_degree = (degree_in_division / div_size) * 30.0
+    
+    # 4. V_DEGREE CAPPING LOGIC
+    capped = v_degree >= 30.0
+    if capped.any():
+        for i in np.flatnonzero(capped).tolist():
+            logger.warning(f"{soa.names[i]}: v_degree {v_degree[i].item()} exceeded 30, capping")
+        v_degree = np.where(capped, 29.9999, v_degree)
+    
+    v_longitude = varga_sign_num * 30 + v_degree
+    
+    # 8. PRECISION CONSTANT
+    varga_chart = _varga_dict(soa, varga_sign_num, v_degree, v_longitude, DEGREE_PRECISION)
+    for planet in varga_chart.values():
+        planet['abs_pos'] = round(planet['abs_pos'], DEGREE_PRECISION)
     
     logger.debug(f"Calculated {divisor} varga with rule {start_rule}")
     return varga_chart
 
-def calculate_d2_hora(chart_data: Dict) -> Dict:
+def calculate_d2_hora(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D2 - Hora (Wealth)"""
-    d2 = {}
-    for p_name, p_data in chart_data.items():
-        if p_name == '_metadata' or not isinstance(p_data, dict) or 'abs_pos' not in p_data: continue
-        sign_num = p_data['sign_num']
-        degree = p_data['degree']
-        
-        # Odd sign: 0-15 Sun (Leo/4), 15-30 Moon (Cancer/3)
-        # Even sign: 0-15 Moon (Cancer/3), 15-30 Sun (Leo/4)
-        is_odd = (sign_num % 2 == 0)
-        if is_odd:
-            h_sign = 4 if degree < 15 else 3
-        else:
-            h_sign = 3 if degree < 15 else 4
-            
-        d2[p_name] = {
-            'name': p_data['name'],
-            'sign': ZODIAC_SIGNS[h_sign],
-            'sign_num': h_sign,
-            'degree': round((degree % 15) * 2, 2),
-            'abs_pos': h_sign * 30 + (degree % 15) * 2
-        }
-    return d2
+    soa = _chart_to_soa(chart_data)
+    soa = _select(soa, soa.has_abs_pos)
+    degree = soa.degree
+    
+    # Odd sign: 0-15 Sun (Leo/4), 15-30 Moon (Cancer/3)
+    # Even sign: 0-15 Moon (Cancer/3), 15-30 Sun (Leo/4)
+    is_odd = (soa.sign_num % 2 == 0)
+    first_half = degree < 15
+    h_signs = np.where(is_odd == first_half, 4, 3)
+    h_degrees = (degree % 15) * 2
+    
+    return _varga_dict(soa, h_signs, h_degrees, h_signs * 30 + h_degrees, 2)
 
-def calculate_d3_drekkana(chart_data: Dict) -> Dict:
+def calculate_d3_drekkana(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D3 - Drekkana (Siblings) - 1, 5, 9 houses from same sign"""
-    d3 = {}
-    for p_name, p_data in chart_data.items():
-        if p_name == '_metadata' or not isinstance(p_data, dict) or 'abs_pos' not in p_data: continue
-        sign_num = p_data['sign_num']
-        degree = p_data['degree']
-        
-        div = int(degree / 10) # 0, 1, 2
-        d3_sign = (sign_num + (div * 4)) % 12
-        
-        d3[p_name] = {
-            'name': p_data['name'],
-            'sign': ZODIAC_SIGNS[d3_sign],
-            'sign_num': d3_sign,
-            'degree': round((degree % 10) * 3, 2),
-            'abs_pos': d3_sign * 30 + (degree % 10) * 3
-        }
-    return d3
+    return _fixed_varga(chart_data, 3)
 
-def calculate_d4_chaturthamsa(chart_data: Dict) -> Dict:
+def calculate_d4_chaturthamsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D4 - Chaturthamsa (Property) - 1, 4, 7, 10 houses"""
-    d4 = {}
-    for p_name, p_data in chart_data.items():
-        if p_name == '_metadata' or not isinstance(p_data, dict) or 'abs_pos' not in p_data: continue
-        sign_num = p_data['sign_num']
-        degree = p_data['degree']
-        
-        div = int(degree / 7.5) # 0, 1, 2, 3
-        d4_sign = (sign_num + (div * 3)) % 12 # 1st, 4th, 7th, 10th
-        
-        d4[p_name] = {
-            'name': p_data['name'],
-            'sign': ZODIAC_SIGNS[d4_sign],
-            'sign_num': d4_sign,
-            'degree': round((degree % 7.5) * 4, 2),
-            'abs_pos': d4_sign * 30 + (degree % 7.5) * 4
-        }
-    return d4
+    return _fixed_varga(chart_data, 4)
 
-def calculate_d7_saptamsa(chart_data: Dict) -> Dict:
+def calculate_d7_saptamsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D7 - Saptamsa (Children) - Odd: from same, Even: from 7th"""
     return calculate_varga(chart_data, 7, 'odd_even_d7')
 
-def calculate_d5_panchamsa(chart_data: Dict) -> Dict:
+def calculate_d5_panchamsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D5 - Panchamsa"""
     return calculate_varga(chart_data, 5, 'odd_even') # Simplified standard
 
-def calculate_d6_shashtamsa(chart_data: Dict) -> Dict:
+def calculate_d6_shashtamsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D6 - Shashtamsa"""
     return calculate_varga(chart_data, 6, 'odd_even') # Simplified standard
 
-def calculate_d7_explicit(chart_data: Dict) -> Dict:
-    d7 = {}
-    div_size = 30.0 / 7
-    for p_name, p_data in chart_data.items():
-        if p_name == '_metadata' or not isinstance(p_data, dict) or 'abs_pos' not in p_data: continue
-        sign_num = p_data['sign_num']
-        degree = p_data['degree']
-        div_idx = int(degree / div_size)
-        
-        if sign_num % 2 == 0: # Odd sign
-            start_sign = sign_num
-        else: # Even sign
-            start_sign = (sign_num + 6) % 12 # 7th from it
-            
-        d7_sign = (start_sign + div_idx) % 12
-        d7[p_name] = {
-            'name': p_data['name'],
-            'sign': ZODIAC_SIGNS[d7_sign],
-            'sign_num': d7_sign,
-            'degree': round((degree % div_size) * (30/div_size), 2),
-            'abs_pos': d7_sign * 30 + (degree % div_size) * (30/div_size)
-        }
-    return d7
+def calculate_d7_explicit(chart_data: Union[Dict, PlanetArrays]) -> Dict:
+    return _fixed_varga(chart_data, 7)
 
-def calculate_d8_ashtamsa(chart_data: Dict) -> Dict:
+def calculate_d8_ashtamsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D8 - Ashtamsa"""
-    d8 = {}
-    div_size = 30.0 / 8
-    for p_name, p_data in chart_data.items():
-        if p_name == '_metadata' or not isinstance(p_data, dict) or 'abs_pos' not in p_data: continue
-        sign_num = p_data['sign_num']
-        degree = p_data['degree']
-        div_idx = int(degree / div_size)
-        
-        if sign_num in [0, 3, 6, 9]: start_sign = 0 # Movable
-        elif sign_num in [1, 4, 7, 10]: start_sign = 8 # Fixed
-        else: start_sign = 4 # Dual
-            
-        d8_sign = (start_sign + div_idx) % 12
-        d8[p_name] = {
-            'name': p_data['name'],
-            'sign': ZODIAC_SIGNS[d8_sign],
-            'sign_num': d8_sign,
-            'degree': round((degree % div_size) * (30/div_size), 2),
-            'abs_pos': d8_sign * 30 + (degree % div_size) * (30/div_size)
-        }
-    return d8
+    return _fixed_varga(chart_data, 8)
 
-def calculate_d16_shodasamsa(chart_data: Dict) -> Dict:
+def calculate_d16_shodasamsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D16 - Shodasamsa (Vehicles, Comfort)"""
-    d16 = {}
-    div_size = 30.0 / 16
-    for p_name, p_data in chart_data.items():
-        if p_name == '_metadata' or not isinstance(p_data, dict) or 'abs_pos' not in p_data: continue
-        sign_num = p_data['sign_num']
-        degree = p_data['degree']
-        div_idx = int(degree / div_size)
-        
-        if sign_num in [0, 3, 6, 9]: # Movable: starts Aries (0)
-            start_sign = 0
-        elif sign_num in [1, 4, 7, 10]: # Fixed: starts Leo (4)
-            start_sign = 4
-        else: # Dual: starts Sagittarius (8)
-            start_sign = 8
-            
-        d16_sign = (start_sign + div_idx) % 12
-        d16[p_name] = {
-            'name': p_data['name'],
-            'sign': ZODIAC_SIGNS[d16_sign],
-            'sign_num': d16_sign,
-            'degree': round((degree % div_size) * (30/div_size), 2),
-            'abs_pos': d16_sign * 30 + (degree % div_size) * (30/div_size)
-        }
-    return d16
+    return _fixed_varga(chart_data, 16)
 
-def calculate_d11_rudramsa(chart_data: Dict) -> Dict:
+def calculate_d11_rudramsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D11 - Rudramsa"""
     # Simple cyclic for now
     return calculate_varga(chart_data, 11, 'same')
 
-def calculate_d20_vimsamsa(chart_data: Dict) -> Dict:
+def calculate_d20_vimsamsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D20 - Vimsamsa (Spirituality)"""
-    d20 = {}
-    div_size = 30.0 / 20
-    for p_name, p_data in chart_data.items():
-        if p_name == '_metadata' or not isinstance(p_data, dict) or 'abs_pos' not in p_data: continue
-        sign_num = p_data['sign_num']
-        degree = p_data['degree']
-        div_idx = int(degree / div_size)
-        
-        if sign_num in [0, 3, 6, 9]: # Movable: starts Aries (0)
-            start_sign = 0
-        elif sign_num in [1, 4, 7, 10]: # Fixed: starts Sagittarius (8)
-            start_sign = 8
-        else: # Dual: starts Leo (4)
-            start_sign = 4
-            
-        d20_sign = (start_sign + div_idx) % 12
-        d20[p_name] = {
-            'name': p_data['name'],
-            'sign': ZODIAC_SIGNS[d20_sign],
-            'sign_num': d20_sign,
-            'degree': round((degree % div_size) * (30/div_size), 2),
-            'abs_pos': d20_sign * 30 + (degree % div_size) * (30/div_size)
-        }
-    return d20
+    return _fixed_varga(chart_data, 20)
 
-def calculate_d24_siddhamsa(chart_data: Dict) -> Dict:
+def calculate_d24_siddhamsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D24 - Siddhamsa (Education)"""
-    d24 = {}
-    div_size = 30.0 / 24
-    for p_name, p_data in chart_data.items():
-        if p_name == '_metadata' or not isinstance(p_data, dict) or 'abs_pos' not in p_data: continue
-        sign_num = p_data['sign_num']
-        degree = p_data['degree']
-        div_idx = int(degree / div_size)
-        
-        # Odd starts Leo(4), Even starts Cancer(3)
-        if sign_num % 2 == 0: start_sign = 4
-        else: start_sign = 3
-            
-        d24_sign = (start_sign + div_idx) % 12
-        d24[p_name] = {
-            'name': p_data['name'],
-            'sign': ZODIAC_SIGNS[d24_sign],
-            'sign_num': d24_sign,
-            'degree': round((degree % div_size) * (30/div_size), 2),
-            'abs_pos': d24_sign * 30 + (degree % div_size) * (30/div_size)
-        }
-    return d24
+    return _fixed_varga(chart_data, 24)
 
-def calculate_d27_nakshatramsa(chart_data: Dict) -> Dict:
+def calculate_d27_nakshatramsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D27 - Nakshatramsa (Strengths)"""
-    d27 = {}
-    div_size = 30.0 / 27
-    for p_name, p_data in chart_data.items():
-        if p_name == '_metadata' or not isinstance(p_data, dict) or 'abs_pos' not in p_data: continue
-        sign_num = p_data['sign_num']
-        degree = p_data['degree']
-        div_idx = int(degree / div_size)
-        
-        # Fire(0,4,8) starts Aries(0), Earth(1,5,9) starts Capricorn(9), 
-        # Air(2,6,10) starts Libra(6), Water(3,7,11) starts Cancer(3)
-        group = sign_num % 4
-        if group == 0: start_sign = 0 # Fire
-        elif group == 1: start_sign = 9 # Earth
-        elif group == 2: start_sign = 6 # Air
-        else: start_sign = 3 # Water
-            
-        d27_sign = (start_sign + div_idx) % 12
-        d27[p_name] = {
-            'name': p_data['name'],
-            'sign': ZODIAC_SIGNS[d27_sign],
-            'sign_num': d27_sign,
-            'degree': round((degree % div_size) * (30/div_size), 2),
-            'abs_pos': d27_sign * 30 + (degree % div_size) * (30/div_size)
-        }
-    return d27
+    return _fixed_varga(chart_data, 27)
+
+# D30 (Parashara): upper degree bounds of each portion and its sign
+# Odd: Aries (Mars) <5, Aquarius (Saturn) <10, Sagittarius (Jupiter) <18, Gemini (Mercury) <25, Libra (Venus)
+# Even: Taurus (Venus) <5, Virgo (Mercury) <12, Pisces (Jupiter) <20, Capricorn (Saturn) <25, Scorpio (Mars)
+D30_ODD_BOUNDS, D30_ODD_SIGNS = np.array([5, 10, 18, 25]), np.array([0, 10, 8, 2, 6])
+D30_EVEN_BOUNDS, D30_EVEN_SIGNS = np.array([5, 12, 20, 25]), np.array([1, 5, 11, 9, 7])
+# Every bound is a whole degree, so the sign is fixed per (odd/even, whole degree)
+D30_TABLE = np.stack([
+    D30_ODD_SIGNS[np.searchsorted(D30_ODD_BOUNDS, np.arange(30), side='right')],
+    D30_EVEN_SIGNS[np.searchsorted(D30_EVEN_BOUNDS, np.arange(30), side='right')],
+])
 
-def calculate_d30_trimsamsa(chart_data: Dict) -> Dict:
+def calculate_d30_trimsamsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D30 - Trimsamsa (Misfortunes) - Parashara method"""
-    d30 = {}
-    for p_name, p_data in chart_data.items():
-        if p_name == '_metadata' or not isinstance(p_data, dict) or 'abs_pos' not in p_data: continue
-        sign_num = p_data['sign_num']
-        degree = p_data['degree']
-        
-        is_odd = (sign_num % 2 == 0)
-        t_sign = 0
-        if is_odd:
-            if degree < 5: t_sign = 0 # Aries (Mars)
-            elif degree < 10: t_sign = 10 # Aquarius (Saturn)
-            elif degree < 18: t_sign = 8 # Sagittarius (Jupiter)
-            elif degree < 25: t_sign = 2 # Gemini (Mercury)
-            else: t_sign = 6 # Libra (Venus)
-        else:
-            if degree < 5: t_sign = 1 # Taurus (Venus)
-            elif degree < 12: t_sign = 5 # Virgo (Mercury)
-            elif degree < 20: t_sign = 11 # Pisces (Jupiter)
-            elif degree < 25: t_sign = 9 # Capricorn (Saturn)
-            else: t_sign = 7 # Scorpio (Mars)
-            
-        d30[p_name] = {
-            'name': p_data['name'],
+    soa = _chart_to_soa(chart_data)
+    soa = _select(soa, soa.has_abs_pos)
+    degree = soa.degree
+    
+    # Vedic odd signs have even sign_num (row 0); out-of-range degrees take the end portions
+    whole_degree = np.fmax(np.fmin(degree, 29), 0).astype(np.int64)  # fmin: NaN -> 29
+    t_signs = D30_TABLE[soa.sign_num % 2, whole_degree].tolist()
+    
+    return {
+        p_name: {
+            'name': display_name,
             'sign': ZODIAC_SIGNS[t_sign],
             'sign_num': t_sign,
             'degree': 0, # Not usually degree-based in D30 common representation
             'abs_pos': t_sign * 30
         }
-    return d30
+        for p_name, display_name, t_sign in zip(soa.names, soa.display_names, t_signs)
+    }
 
-def calculate_d40_khavedamsa(chart_data: Dict) -> Dict:
+def calculate_d40_khavedamsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D40 - Khavedamsa (Auspicious effects)"""
-    d40 = {}
-    div_size = 30.0 / 40
-    for p_name, p_data in chart_data.items():
-        if p_name == '_metadata' or not isinstance(p_data, dict) or 'abs_pos' not in p_data: continue
-        sign_num = p_data['sign_num']
-        degree = p_data['degree']
-        div_idx = int(degree / div_size)
-        
-        # Odd starts Aries(0), Even starts Libra(6)
-        if sign_num % 2 == 0: start_sign = 0
-        else: start_sign = 6
-            
-        d40_sign = (start_sign + div_idx) % 12
-        d40[p_name] = {
-            'name': p_data['name'],
-            'sign': ZODIAC_SIGNS[d40_sign],
-            'sign_num': d40_sign,
-            'degree': round((degree % div_size) * (30/div_size), 2),
-            'abs_pos': d40_sign * 30 + (degree % div_size) * (30/div_size)
-        }
-    return d40
+    return _fixed_varga(chart_data, 40)
 
-def calculate_d45_akshavedamsa(chart_data: Dict) -> Dict:
+def calculate_d45_akshavedamsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D45 - Akshavedamsa (All areas)"""
-    d45 = {}
-    div_size = 30.0 / 45
-    for p_name, p_data in chart_data.items():
-        if p_name == '_metadata' or not isinstance(p_data, dict) or 'abs_pos' not in p_data: continue
-        sign_num = p_data['sign_num']
-        degree = p_data['degree']
-        div_idx = int(degree / div_size)
-        
-        if sign_num in [0, 3, 6, 9]: start_sign = 0 # Movable
-        elif sign_num in [1, 4, 7, 10]: start_sign = 4 # Fixed
-        else: start_sign = 8 # Dual
-            
-        d45_sign = (start_sign + div_idx) % 12
-        d45[p_name] = {
-            'name': p_data['name'],
-            'sign': ZODIAC_SIGNS[d45_sign],
-            'sign_num': d45_sign,
-            'degree': round((degree % div_size) * (30/div_size), 2),
-            'abs_pos': d45_sign * 30 + (degree % div_size) * (30/div_size)
-        }
-    return d45
+    return _fixed_varga(chart_data, 45)
 
-def calculate_d60_shashtyamsa(chart_data: Dict) -> Dict:
+def calculate_d60_shashtyamsa(chart_data: Union[Dict, PlanetArrays]) -> Dict:
     """D60 - Shashtyamsa (General/Subtle) - Counts from same sign"""
-    d60 = {}
-    div_size = 30.0 / 60
-    for p_name, p_data in chart_data.items():
-        if p_name == '_metadata' or not isinstance(p_data, dict) or 'abs_pos' not in p_data: continue
-        sign_num = p_data['sign_num']
-        degree = p_data['degree']
-        div_idx = int(degree / div_size)
-        
-        d60_sign = (sign_num + div_idx) % 12
-        d60[p_name] = {
-            'name': p_data['name'],
-            'sign': ZODIAC_SIGNS[d60_sign],
-            'sign_num': d60_sign,
-            'degree': round((degree % div_size) * (30/div_size), 2),
-            'abs_pos': d60_sign * 30 + (degree % div_size) * (30/div_size)
-        }
-    return d60
+    return _fixed_varga(chart_data, 60)
 
-def calculate_moon_chart(chart_data: Dict) -> Dict:
+def _d1_chart(chart_data: Dict, d1: Optional[Dict] = None) -> Dict:
+    """New D1 chart dict (without _metadata), copied from d1 when already filtered."""
+    if d1 is not None:
+        return dict(d1)
+    return {k: v for k, v in chart_data.items() if k != '_metadata'}
+
+def calculate_moon_chart(chart_data: Dict, d1: Optional[Dict] = None) -> Dict:
     """Moon Chart (Chandra Lagna) - D1 with Moon as Ascendant"""
-    moon_sign = chart_data.get('moon', {}).get('sign_num', 0)
-    res = {k: v for k, v in chart_data.items() if k != '_metadata'}
-    res['ascendant'] = chart_data['moon'].copy()
-    res['ascendant']['name'] = 'Chandra Lagna'
+    res = _d1_chart(chart_data, d1)
+    res['ascendant'] = {**chart_data['moon'], 'name': 'Chandra Lagna'}
     return res
 
-def calculate_sun_chart(chart_data: Dict) -> Dict:
+def calculate_sun_chart(chart_data: Dict, d1: Optional[Dict] = None) -> Dict:
     """Sun Chart (Surya Lagna) - D1 with Sun as Ascendant"""
-    sun_sign = chart_data.get('sun', {}).get('sign_num', 0)
-    res = {k: v for k, v in chart_data.items() if k != '_metadata'}
-    res['ascendant'] = chart_data['sun'].copy()
-    res['ascendant']['name'] = 'Surya Lagna'
+    res = _d1_chart(chart_data, d1)
+    res['ascendant'] = {**chart_data['sun'], 'name': 'Surya Lagna'}
     return res
 
-def calculate_arudha_lagna(chart_data: Dict) -> Dict:
+def calculate_arudha_lagna(chart_data: Dict, d1: Optional[Dict] = None) -> Dict:
     """Arudha Lagna (AL) Calculation"""
     # Simple version: AL = Lagna Lord pos from Lagna, then same distance from Lord
     # We need SIGN_LORDS from astrology.py, let's just use a local copy or import
@@ -505,7 +421,7 @@ def calculate_arudha_lagna(chart_data: Dict) -> Dict:
     elif (al_sign - asc_sign) % 12 == 6:
         al_sign = (al_sign + 3) % 12
     
-    res = {k: v for k, v in chart_data.items() if k != '_metadata'}
+    res = _d1_chart(chart_data, d1)
     asc = chart_data['ascendant'].copy()
     asc['sign_num'] = al_sign
     asc['sign'] = ZODIAC_SIGNS[al_sign]
@@ -514,31 +430,70 @@ def calculate_arudha_lagna(chart_data: Dict) -> Dict:
     res['ascendant'] = asc
     return res
 
+# Planet-array fingerprint -> D2..D60 charts; regenerated charts are new dicts with equal inputs
+VARGA_CACHE_SIZE = 256
+_varga_cache: Dict[tuple, Dict[str, Dict]] = {}
+
+def _soa_fingerprint(soa: PlanetArrays) -> tuple:
+    """Every planet input the divisional charts read, exactly."""
+    return (
+        tuple(soa.names), tuple(soa.display_names), tuple(soa.sign_num.tolist()),
+        tuple(soa.degree.tolist()), tuple(soa.has_abs_pos.tolist())
+    )
+
+def _divisional_charts(soa: PlanetArrays) -> Dict[str, Dict]:
+    """The D2..D60 charts, all computed from the shared planet arrays."""
+    fixed = _fixed_vargas(soa)
+    return {
+        'd2_chart': calculate_d2_hora(soa),
+        'd3_chart': fixed[3],
+        'd4_chart': fixed[4],
+        'd5_chart': calculate_d5_panchamsa(soa),
+        'd6_chart': calculate_d6_shashtamsa(soa),
+        'd7_chart': fixed[7],
+        'd8_chart': fixed[8],
+        'd9_chart': calculate_varga(soa, 9, 'movable_fixed_dual'),
+        'd10_chart': calculate_varga(soa, 10, 'odd_even'),
+        'd11_chart': calculate_d11_rudramsa(soa),
+        'd12_chart': calculate_varga(soa, 12, 'same'),
+        'd16_chart': fixed[16],
+        'd20_chart': fixed[20],
+        'd24_chart': fixed[24],
+        'd27_chart': fixed[27],
+        'd30_chart': calculate_d30_trimsamsa(soa),
+        'd40_chart': fixed[40],
+        'd45_chart': fixed[45],
+        'd60_chart': fixed[60]
+    }
+
 def calculate_all_vargas(chart_data: Dict) -> Dict:
-    """Calculate all varga charts and return a dictionary"""
+    """
+    Calculate all varga charts and return a dictionary
+    
+    The D2..D60 charts are memoized on an exact fingerprint of the planet
+    signs/degrees; the D1-derived charts share chart_data's dicts and are
+    rebuilt every call.
+    """
+    # Planet signs/degrees gathered once and shared by every divisional chart
+    soa = _chart_to_soa(chart_data)
+    fingerprint = _soa_fingerprint(soa)
+    divisional = _varga_cache.get(fingerprint)
+    if divisional is None:
+        divisional = _divisional_charts(soa)
+        if len(_varga_cache) >= VARGA_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            _varga_cache.pop(next(iter(_varga_cache)), None)
+        _varga_cache[fingerprint] = divisional
+    
+    # _metadata filtered out once; the Lagna charts start from copies of it
+    d1 = _d1_chart(chart_data)
     vargas = {
-        'd1_chart': {k: v for k, v in chart_data.items() if k != '_metadata'},
-        'moon_chart': calculate_moon_chart(chart_data),
-        'sun_chart': calculate_sun_chart(chart_data),
-        'arudha_chart': calculate_arudha_lagna(chart_data),
-        'd2_chart': calculate_d2_hora(chart_data),
-        'd3_chart': calculate_d3_drekkana(chart_data),
-        'd4_chart': calculate_d4_chaturthamsa(chart_data),
-        'd5_chart': calculate_d5_panchamsa(chart_data),
-        'd6_chart': calculate_d6_shashtamsa(chart_data),
-        'd7_chart': calculate_d7_explicit(chart_data),
-        'd8_chart': calculate_d8_ashtamsa(chart_data),
-        'd9_chart': calculate_varga(chart_data, 9, 'movable_fixed_dual'),
-        'd10_chart': calculate_varga(chart_data, 10, 'odd_even'),
-        'd11_chart': calculate_d11_rudramsa(chart_data),
-        'd12_chart': calculate_varga(chart_data, 12, 'same'),
-        'd16_chart': calculate_d16_shodasamsa(chart_data),
-        'd20_chart': calculate_d20_vimsamsa(chart_data),
-        'd24_chart': calculate_d24_siddhamsa(chart_data),
-        'd27_chart': calculate_d27_nakshatramsa(chart_data),
-        'd30_chart': calculate_d30_trimsamsa(chart_data),
-        'd40_chart': calculate_d40_khavedamsa(chart_data),
-        'd45_chart': calculate_d45_akshavedamsa(chart_data),
-        'd60_chart': calculate_d60_shashtyamsa(chart_data)
+        'd1_chart': d1,
+        'moon_chart': calculate_moon_chart(chart_data, d1),
+        'sun_chart': calculate_sun_chart(chart_data, d1),
+        'arudha_chart': calculate_arudha_lagna(chart_data, d1),
     }
+    # Callers get fresh planet dicts so edits never leak into the cache
+    for v_name, v_chart in divisional.items():
+        vargas[v_name] = {p_name: dict(p_data) for p_name, p_data in v_chart.items()}
     return vargas
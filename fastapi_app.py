@@ -4,11 +4,12 @@ Provides REST API endpoints for chart generation and AI predictions
 """
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse as APIResponse
+from fastapi.responses import JSONResponse as APIResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Dict, Any, List
 from datetime import datetime
+import asyncio
 import time
 import os
 from collections import defaultdict
@@ -56,7 +57,8 @@ class ChartRequest(BaseModel):
     birth_time: str = Field(..., description="Format: HH:MM")
     birth_place: str = Field(..., min_length=1)
     
-    @validator('birth_date')
+    @field_validator('birth_date')
+    @classmethod
     def validate_date(cls, v):
         try:
             dt = datetime.strptime(v, "%Y-%m-%d")
@@ -66,7 +68,8 @@ class ChartRequest(BaseModel):
         except ValueError as e:
             raise ValueError(f"Invalid date format. Use YYYY-MM-DD. {str(e)}")
     
-    @validator('birth_time')
+    @field_validator('birth_time')
+    @classmethod
     def validate_time(cls, v):
         try:
             parts = v.split(":")
@@ -140,7 +143,7 @@ async def generate_chart(request: ChartRequest, req: Request):
         hour, minute = int(time_parts[0]), int(time_parts[1])
         
         # Get location data
-        loc_data = get_location_data(request.birth_place)
+        loc_data = await get_location_data(request.birth_place)
         if not loc_data:
             raise HTTPException(
                 status_code=400,
@@ -150,8 +153,9 @@ async def generate_chart(request: ChartRequest, req: Request):
         lat, lon, address = loc_data
         logger.info(f"Location resolved: {address} ({lat}, {lon})")
         
-        # Generate chart
-        chart = generate_vedic_chart(
+        # Generate chart in a worker thread so the event loop keeps serving
+        chart = await asyncio.to_thread(
+            generate_vedic_chart,
             request.name,
             dt.year, dt.month, dt.day,
             hour, minute,
@@ -168,7 +172,9 @@ async def generate_chart(request: ChartRequest, req: Request):
             chart.metadata.gender = request.gender
         
         logger.info(f"Chart generated successfully for {request.name}")
-        return chart
+        # Serialize once in pydantic-core; returning a Response skips FastAPI's
+        # re-validation of the chart against response_model (kept for the docs)
+        return Response(content=chart.model_dump_json(), media_type="application/json")
         
     except HTTPException:
         raise
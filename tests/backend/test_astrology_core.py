@@ -85,3 +85,57 @@ def test_planetary_positions_plausibility():
     diff = abs(rahu_pos - ketu_pos)
     assert pytest.approx(diff, 0.1) == 180 or pytest.approx(diff, 0.1) == 180 # modulo check
     assert pytest.approx((rahu_pos + 180) % 360, 0.1) == ketu_pos
+
+def test_nakshatras_by_longitudes_matches_scalar():
+    """Vectorized nakshatra/pada lookup agrees with the scalar version."""
+    from backend.nakshatra_data import get_nakshatra_by_longitude, get_nakshatras_by_longitudes
+    longitudes = [0.0, 3.3334, 13.3334, 200.5, 359.9999, 360.0, -10.0, 725.0]
+    nak_nums, padas = get_nakshatras_by_longitudes(longitudes)
+    
+    for lon, nak_num, pada in zip(longitudes, nak_nums, padas):
+        nak_dict, expected_pada = get_nakshatra_by_longitude(lon)
+        assert nak_num == nak_dict['number']
+        assert pada == expected_pada
+
+def test_nakshatra_boundaries_use_exact_spans():
+    """Nakshatras are exactly 13°20' wide, not 13.33333°."""
+    from backend.nakshatra_data import get_nakshatra_by_longitude
+    nak_dict, pada = get_nakshatra_by_longitude(13.333331)
+    assert (nak_dict['name'], pada) == ('Ashwini', 4)
+    nak_dict, pada = get_nakshatra_by_longitude(13.3334)
+    assert (nak_dict['name'], pada) == ('Bharani', 1)
+    nak_dict, pada = get_nakshatra_by_longitude(359.9999)
+    assert (nak_dict['name'], pada) == ('Revati', 4)
+
+def test_nakshatra_details_prerendered():
+    """Pre-rendered details match a fresh render, including for copied dicts."""
+    from backend.nakshatra_data import NAKSHATRAS, get_nakshatra_details
+    nak = NAKSHATRAS[5]
+    details = get_nakshatra_details(nak, 3)
+    assert "Pada (Quarter): 3/4" in details
+    assert nak['name'].upper() in details
+    assert get_nakshatra_details(dict(nak), 3) == details
+
+def test_nakshatra_columns_align_with_records():
+    """Columnar nakshatra tuples are indexed by nakshatra number."""
+    from backend.nakshatra_data import NAKSHATRAS, NAKSHATRA_NAMES, NAKSHATRA_LORDS
+    assert len(NAKSHATRA_NAMES) == len(NAKSHATRA_LORDS) == 27
+    for nak in NAKSHATRAS:
+        assert NAKSHATRA_NAMES[nak['number']] == nak['name']
+        assert NAKSHATRA_LORDS[nak['number']] == nak['lord']
+
+def test_nakshatra_details_bytes_match_text():
+    """The bytes variant is the UTF-8 encoding of the text details."""
+    from backend.nakshatra_data import NAKSHATRAS, get_nakshatra_details, get_nakshatra_details_bytes
+    for nak in (NAKSHATRAS[0], dict(NAKSHATRAS[26])):
+        assert get_nakshatra_details_bytes(nak, 2) == get_nakshatra_details(nak, 2).encode('utf-8')
+
+def test_nakshatra_records_vectorized_lords():
+    """Record-array lords agree with the nakshatra dicts for a batch."""
+    from backend.nakshatra_data import (
+        NAKSHATRAS, NAKSHATRA_RECORDS, NAKSHATRA_LORD_NAMES, get_nakshatras_by_longitudes
+    )
+    nak_nums, _ = get_nakshatras_by_longitudes([0.0, 95.5, 200.0, 359.9])
+    lords = [NAKSHATRA_LORD_NAMES[i] for i in NAKSHATRA_RECORDS['lord'][nak_nums]]
+    assert lords == [NAKSHATRAS[n]['lord'] for n in nak_nums]
+    assert NAKSHATRA_RECORDS['lucky_number'].tolist() == [nak['lucky_number'] for nak in NAKSHATRAS]
@@ -12,23 +12,23 @@ def test_drill_down_logic():
     
     # Test 0 offset (Start of Cycle -> Ketu/Ketu/Ketu/Ketu/Ketu)
     res = ds._drill_down_dasha(0.0)
-    assert res['maha']['lord'] == 'Ketu'
-    assert res['antar']['lord'] == 'Ketu'
-    assert res['prana']['lord'] == 'Ketu'
+    assert res.maha.lord == 'Ketu'
+    assert res.antar.lord == 'Ketu'
+    assert res.prana.lord == 'Ketu'
     
     # Test offset into Venus Maha Dasha
     # Ketu (7 years). Venus starts at Year 7.
     # Offset 7.0 + epsilon
     res = ds._drill_down_dasha(7.001)
-    assert res['maha']['lord'] == 'Venus'
-    assert res['antar']['lord'] == 'Venus' # First Antar of Venus is Venus
+    assert res.maha.lord == 'Venus'
+    assert res.antar.lord == 'Venus' # First Antar of Venus is Venus
     
     # Test offset into Venus/Sun Antar Dasha
     # Venus/Venus duration = 20 * 20 / 120 = 400/120 = 3.333 years.
     # Venus/Sun starts at 7 + 3.333 = 10.333
     res = ds._drill_down_dasha(10.5)
-    assert res['maha']['lord'] == 'Venus'
-    assert res['antar']['lord'] == 'Sun'
+    assert res.maha.lord == 'Venus'
+    assert res.antar.lord == 'Sun'
 
 def test_timeline_generation_structure():
     ds = VimshottariDashaSystem()
@@ -68,3 +68,59 @@ def test_birth_balance_mid_period():
     
     assert timeline[0]['lord'] == 'Ketu'
     assert timeline[0]['duration_years'] == pytest.approx(3.5, rel=1e-2)
+
+def test_complete_dasha_tags_current_timeline_nodes():
+    ds = VimshottariDashaSystem()
+    birth_jd = 2451545.0
+    # Moon at 0 Aries: Ketu (7y) then Venus. 10.5 years in -> Venus/Sun
+    info = ds.calculate_complete_dasha(0.0, birth_jd, birth_jd + 10.5 * 365.25)
+    
+    current_mahas = [p for p in info.timeline if p.is_current]
+    assert len(current_mahas) == 1
+    assert current_mahas[0].lord == info.current_state.maha_dasha.lord == 'Venus'
+    
+    current_antars = [p for p in current_mahas[0].sub_periods if p.is_current]
+    assert len(current_antars) == 1
+    assert current_antars[0].lord == info.current_state.antar_dasha.lord == 'Sun'
+
+def test_complete_dasha_uses_exact_current_time():
+    ds = VimshottariDashaSystem()
+    birth_jd = 2451545.0
+    morning = ds.calculate_complete_dasha(42.0, birth_jd, 2460000.1)
+    evening = ds.calculate_complete_dasha(42.0, birth_jd, 2460000.9)
+    
+    # Same birth timeline, but the state is evaluated at each exact moment
+    assert morning.current_state == ds._build_complete_dasha(42.0, birth_jd, 2460000.1).current_state
+    assert evening.current_state == ds._build_complete_dasha(42.0, birth_jd, 2460000.9).current_state
+    assert morning.current_state.prana_dasha.start_jd == 2460000.1
+    assert evening.current_state.prana_dasha.start_jd == 2460000.9
+    
+    # Each call gets its own models; edits never leak into later results
+    morning.timeline[0].sub_periods.clear()
+    morning.timeline.clear()
+    again = ds.calculate_complete_dasha(42.0, birth_jd, 2460000.1)
+    assert again.timeline and again.timeline[0].sub_periods
+    assert again.model_dump() == ds._build_complete_dasha(42.0, birth_jd, 2460000.1).model_dump()
+
+def test_timeline_arrays_match_nested_timeline():
+    import json
+    ds = VimshottariDashaSystem()
+    birth_jd = 2451545.0
+    nested = ds.generate_timeline(100.0, birth_jd, max_level=3)
+    flat = ds.generate_timeline_arrays(100.0, birth_jd, max_level=3)
+    
+    # Depth-first flattening of the nested structure
+    def walk(nodes):
+        for node in nodes:
+            yield node
+            yield from walk(node.get('sub_periods', []))
+    expected = list(walk(nested))
+    
+    rows = list(flat.rows())
+    assert len(flat) == len(expected)
+    assert [r['lord'] for r in rows] == [n['lord'] for n in expected]
+    assert [r['level'] for r in rows] == [n['level'] for n in expected]
+    assert rows[0]['parent'] == -1
+    # Every sub-period points back at a row one level up
+    assert all(rows[r['parent']]['level'] == r['level'] - 1 for r in rows if r['parent'] >= 0)
+    assert json.loads(flat.to_json()) == rows
@@ -61,3 +61,13 @@ def test_node_physics():
     assert ketu.declination == -rahu.declination
     assert ketu.speed == rahu.speed
     assert ketu.is_retrograde == rahu.is_retrograde
+
+def test_schema_float_rounding():
+    """Position floats are rounded on input; KP cusps keep 4 decimals."""
+    from backend.schemas import HouseData, KPCuspInfo
+    house = HouseData(sign="Aries", sign_num=0, degree=12.34567,
+                      degree_in_sign=12.34567, cusp_degree=12.34567)
+    assert (house.degree, house.degree_in_sign, house.cusp_degree) == (12.35, 12.35, 12.35)
+    cusp = KPCuspInfo(cusp_degree=12.345678, sign="Aries", sign_num=0,
+                      degree_in_sign=12.345678, star_lord="Ketu", sub_lord="Venus")
+    assert (cusp.cusp_degree, cusp.degree_in_sign) == (12.3457, 12.3457)
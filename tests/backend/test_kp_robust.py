@@ -127,3 +127,28 @@ def test_placidus_cusps_range():
         assert kp_data['cusps'][h]['sub_lord'] in PLANET_SEQUENCE
         # Sign num should be 0-11
         assert 0 <= kp_data['cusps'][h]['sign_num'] <= 11
+
+def test_kp_batch_matches_scalar():
+    """Verify vectorized star/sub lords agree with the scalar helpers."""
+    import numpy as np
+    from backend.kp_calculations import kp_batch
+    span = 360 / 27
+    lons = [0.0, 0.7, 0.8, span - 0.000001, span + 0.0001, 239.99, 359.9999, 360.0, -10.0, 720.5]
+    lons += [i * 3.7 for i in range(98)]
+    star_idx, sub_idx = kp_batch(np.array(lons))
+    for lon, s_i, sub_i in zip(lons, star_idx, sub_idx):
+        assert PLANET_SEQUENCE[s_i] == get_nakshatra_info(lon)[1]
+        assert PLANET_SEQUENCE[sub_i] == calculate_sub_lord(lon)
+
+def test_sub_lord_cache_absorbs_float_jitter():
+    """Longitudes differing only by float noise share one cache entry."""
+    from backend.kp_calculations import _sub_lord_q
+    _sub_lord_q.cache_clear()
+    assert calculate_sub_lord(123.456789) == calculate_sub_lord(123.456789 + 1e-12)
+    info = _sub_lord_q.cache_info()
+    assert info.misses == 1 and info.hits == 1
+
+def test_sub_lords_batch_matches_scalar():
+    from backend.kp_calculations import calculate_sub_lords_batch
+    lons = [0.0, 0.7, 0.8, 239.99, 359.9999, -10.0] + [i * 11.3 for i in range(24)]
+    assert calculate_sub_lords_batch(lons) == [calculate_sub_lord(lon) for lon in lons]
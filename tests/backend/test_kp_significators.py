@@ -11,6 +11,8 @@ from backend.kp_significators import (
     build_optimized_house_payload,
     get_house_occupants,
     get_house_owners,
+    get_occupant_houses,
+    get_owner_houses,
     get_star_lord_map,
     PLANET_CODES,
     SIGN_CODES,
@@ -151,6 +153,61 @@ class TestSignificatorEngine:
         for planet in planets:
             significators = calculate_planet_significators(planet, sample_chart)
             assert len(significators) >= 1, f"{planet} should have at least 1 significator"
+    
+    def test_inverted_maps_match_house_scans(self, sample_chart):
+        """Planet -> houses maps agree with scanning the per-house maps."""
+        house_occupants = get_house_occupants(sample_chart)
+        house_owners = get_house_owners(sample_chart)
+        occupant_to_houses = get_occupant_houses(house_occupants)
+        owner_to_houses = get_owner_houses(house_owners)
+        
+        for planet in ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]:
+            assert occupant_to_houses.get(planet, []) == [h for h, occ in house_occupants.items() if planet in occ]
+            assert owner_to_houses.get(planet, []) == [h for h, owner in house_owners.items() if owner == planet]
+
+    
+    def test_chart_indices_match_separate_passes(self, sample_chart):
+        """The fused single-pass indices equal the per-helper results."""
+        from backend.kp_significators import _chart_indices
+        occ, own, star_lords, planets_norm, kp_norm = _chart_indices(sample_chart)
+        
+        assert dict(occ) == dict(get_occupant_houses(get_house_occupants(sample_chart)))
+        assert dict(own) == dict(get_owner_houses(get_house_owners(sample_chart)))
+        assert star_lords == get_star_lord_map(sample_chart)
+        assert planets_norm["sun"] is sample_chart.planets["sun"]
+        assert kp_norm["sun"] is sample_chart.kp_data.planets["sun"]
+    
+    def test_house_owners_from_sign_num(self, sample_chart):
+        """House owners resolve from sign_num and agree with sign-name lordship."""
+        from backend.schemas import HouseData
+        from backend.kp_significators import SIGN_NAMES
+        sample_chart.houses = {
+            h: HouseData(sign=SIGN_NAMES[(h + 3) % 12], sign_num=(h + 3) % 12,
+                         degree=0.0, degree_in_sign=0.0, cusp_degree=0.0)
+            for h in range(1, 13)
+        }
+        owners = get_house_owners(sample_chart)
+        assert owners == {h: SIGN_LORDS[SIGN_NAMES[(h + 3) % 12]] for h in range(1, 13)}
+
+    
+    def test_batch_significators_match_scalar(self, sample_chart):
+        """The vectorized batch engine agrees with the per-planet rules."""
+        from backend.schemas import HouseData
+        from backend.kp_significators import (
+            SIGN_NAMES, PAYLOAD_PLANETS, calculate_chart_significators_batch
+        )
+        sample_chart.houses = {
+            h: HouseData(sign=SIGN_NAMES[(h + 3) % 12], sign_num=(h + 3) % 12,
+                         degree=0.0, degree_in_sign=0.0, cusp_degree=0.0)
+            for h in range(1, 13)
+        }
+        matrix = calculate_chart_significators_batch([sample_chart, sample_chart])
+        assert matrix.shape == (2, 10, 12)
+        
+        for i, (name, _, _) in enumerate(PAYLOAD_PLANETS):
+            expected = calculate_planet_significators(name, sample_chart)
+            assert [h + 1 for h in matrix[0, i].nonzero()[0]] == expected
+            assert (matrix[1, i] == matrix[0, i]).all()
 
 
 class TestOptimizedPayload:
@@ -168,7 +225,7 @@ class TestOptimizedPayload:
         assert isinstance(sun_data[0], str)  # Sign code
         assert isinstance(sun_data[1], str)  # Star lord code
         assert isinstance(sun_data[2], str)  # Sub lord code
-        assert isinstance(sun_data[4], list)  # Significators
+        assert isinstance(sun_data[4], tuple)  # Significators
     
     def test_planet_codes_used(self, sample_chart):
         """Payload should use 2-letter planet codes."""
@@ -177,6 +234,41 @@ class TestOptimizedPayload:
         for key in payload.keys():
             assert len(key) == 2 or len(key) == 3, f"Planet code {key} should be 2-3 letters"
     
+    def test_payloads_memoized_per_chart(self, sample_chart):
+        """Repeat builds reuse the cached payload but hand out fresh dicts."""
+        from backend.schemas import HouseData
+        from backend.kp_significators import SIGN_NAMES, _build_planet_payload
+        first = build_optimized_planet_payload(sample_chart)
+        first["Mo"] = None
+        
+        second = build_optimized_planet_payload(sample_chart)
+        assert second["Su"] is first["Su"]  # Immutable entries are shared
+        assert second["Mo"] is not None
+        
+        # Replacing the houses changes house ownership, so the payload is rebuilt
+        sample_chart.houses = {
+            h: HouseData(sign=SIGN_NAMES[(h + 3) % 12], sign_num=(h + 3) % 12,
+                         degree=0.0, degree_in_sign=0.0, cusp_degree=0.0)
+            for h in range(1, 13)
+        }
+        assert build_optimized_planet_payload(sample_chart) == _build_planet_payload(sample_chart)
+        
+        # Replacing attached KP data invalidates the entry
+        sample_chart.kp_data = None
+        assert build_optimized_house_payload(sample_chart) == {}
+    
+    def test_planets_without_kp_data_are_skipped(self, sample_chart):
+        """Planets missing from KP data are dropped; the Ascendant is kept."""
+        kp_planets = dict(sample_chart.kp_data.planets)
+        kp_planets.pop("mars")
+        kp_planets.pop("ascendant", None)
+        sample_chart.kp_data = sample_chart.kp_data.model_copy(update={"planets": kp_planets})
+        
+        payload = build_optimized_planet_payload(sample_chart)
+        assert "Ma" not in payload
+        assert "Su" in payload
+        assert payload["Asc"][1:3] == ("?", "?")
+    
     def test_house_payload_structure(self, sample_chart):
         """House payload should have correct structure: [Sign, Sub_Lord]"""
         payload = build_optimized_house_payload(sample_chart)
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import backend.location as location
+
+
+def test_geocoding_cache_survives_restart(monkeypatch):
+    """A lookup persisted to SQLite is served without hitting Nominatim again."""
+    calls = []
+
+    class FakeGeocoder:
+        def geocode(self, place_name):
+            calls.append(place_name)
+            return SimpleNamespace(latitude=28.61, longitude=77.21, address="New Delhi, India")
+
+    # GEOCACHE_PATH already points at tmp_path (isolated_geocache in conftest)
+    monkeypatch.setattr(location, "_GEOLOCATOR", FakeGeocoder())
+
+    assert location._sync_geocoding_lookup("New Delhi") == (28.61, 77.21, "New Delhi, India")
+
+    # Simulate a restart: drop the in-memory cache and the open connection
+    location._sync_geocoding_lookup.cache_clear()
+    location._geocache_conn.close()
+    monkeypatch.setattr(location, "_geocache_conn", None)
+
+    assert location._sync_geocoding_lookup("New Delhi") == (28.61, 77.21, "New Delhi, India")
+    assert calls == ["New Delhi"]
+
+
+def test_concurrent_lookups_share_one_request(monkeypatch):
+    """Simultaneous lookups of one place make a single upstream call."""
+    import asyncio
+    import threading
+
+    calls = []
+    release = threading.Event()
+
+    def slow_lookup(place_name):
+        calls.append(place_name)
+        release.wait(5)
+        return (19.07, 72.87, "Mumbai, India")
+
+    monkeypatch.setattr(location, "_sync_geocoding_lookup", slow_lookup)
+
+    async def run():
+        tasks = [asyncio.create_task(location.get_location_data("Mumbai")) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(run())
+    assert results == [(19.07, 72.87, "Mumbai, India")] * 5
+    assert calls == ["Mumbai"]
+    assert location._inflight == {}
@@ -34,6 +34,22 @@ def test_shadbala_integration(chart_factory):
         assert score > 0, f"{planet} has 0 strength"
         assert score < 1000, f"{planet} strength too high {score}"
 
+def test_drik_bala_all_matches_per_planet(chart_factory):
+    """Per-chart Drik Bala agrees with the per-planet function."""
+    from backend.shadbala import calculate_drik_bala_all
+    chart = chart_factory(planets=[
+        {'name': 'Sun', 'degree': 10.0, 'sign': 'Aries', 'sign_num': 0},
+        {'name': 'Moon', 'degree': 5.0, 'sign': 'Cancer', 'sign_num': 3},
+        {'name': 'Mars', 'degree': 10.0, 'sign': 'Capricorn', 'sign_num': 9},
+        {'name': 'Jupiter', 'degree': 5.0, 'sign': 'Leo', 'sign_num': 4},
+        {'name': 'Saturn', 'degree': 20.0, 'sign': 'Libra', 'sign_num': 6}
+    ])
+    
+    scores = calculate_drik_bala_all(chart)
+    assert set(scores) == {'sun', 'moon', 'mars', 'jupiter', 'saturn'}
+    for key, score in scores.items():
+        assert score == calculate_drik_bala(key.capitalize(), chart.planets[key], chart)
+
 def test_sthana_bala_exaltation_factory(chart_factory):
     """Test Exaltation (Uccha Bala) calculations correctly using factory"""
     # Sun at 10.0 Aries (Deep Exaltation)
@@ -149,3 +165,32 @@ def test_ayana_bala_physics(chart_factory, planet, declination, high_score):
         assert total_kala < 80.0  # Low Ayana but still has Natonnata or Paksha strength
 
 
+
+def test_shadbala_data_normalized_keys():
+    """Lowercase view of the totals is built once and matches the raw dict."""
+    from backend.schemas import ShadbalaData
+    data = ShadbalaData(total_shadbala={'Sun': 400.5, 'Moon': 350.0})
+    assert data.normalized == {'sun': 400.5, 'moon': 350.0}
+    assert data.normalized is data.normalized
+    assert data.model_dump() == {'total_shadbala': {'Sun': 400.5, 'Moon': 350.0}}
+
+def test_drishti_values_vectorized_matches_scalar():
+    """Array drishti values equal the scalar piecewise function, boundaries included."""
+    from backend.shadbala import get_drishti_value, get_drishti_values
+    angles = [0.0, 29.9, 30.0, 45.0, 60.0, 75.0, 90.0, 105.0, 120.0, 135.0, 150.0, 165.0, 180.0, 270.0]
+    assert get_drishti_values(angles).tolist() == [get_drishti_value(a) for a in angles]
+
+def test_shadbala_cache_by_fingerprint(chart_factory):
+    """Equal charts share a cached result; callers get independent copies."""
+    planets = [
+        {'name': 'Sun', 'degree': 10.0, 'sign': 'Aries', 'sign_num': 0, 'speed': 1.0},
+        {'name': 'Moon', 'degree': 5.0, 'sign': 'Taurus', 'sign_num': 1, 'speed': 13.0},
+        {'name': 'Mars', 'degree': 10.0, 'sign': 'Capricorn', 'sign_num': 9}
+    ]
+    first = calculate_shadbala_for_chart(chart_factory(planets=planets))
+    first['Sun'] = -1.0
+    second = calculate_shadbala_for_chart(chart_factory(planets=planets))
+    assert second['Sun'] > 0
+    
+    moved = [dict(planets[0], degree=20.0)] + planets[1:]
+    assert calculate_shadbala_for_chart(chart_factory(planets=moved))['Sun'] != second['Sun']
@@ -1,6 +1,6 @@
 import pytest
 import logging
-from backend.varga_charts import calculate_varga, ZODIAC_SIGNS
+from backend.varga_charts import calculate_varga, calculate_all_vargas, ZODIAC_SIGNS
 
 def test_calculate_varga_d12_same():
     # D12 - Same rule (D12 starts from same sign)
@@ -41,6 +41,17 @@ def test_calculate_varga_d10_odd_even():
     res2 = calculate_varga(chart2, 10, 'odd_even')
     assert res2['sun']['sign'] == 'Capricorn'
 
+def test_calculate_varga_d7_odd_even():
+    # D7 - Odd sign starts from itself, Even sign from the 7th
+    chart = {'sun': {'name': 'Sun', 'sign_num': 0, 'degree': 5.0}}
+    res = calculate_varga(chart, 7, 'odd_even_d7')
+    assert res['sun']['sign'] == 'Taurus'
+    
+    # Taurus(1) (Even) -> 7th from it (Scorpio), 2nd division (4.29 to 8.57) -> Sagittarius
+    chart2 = {'sun': {'name': 'Sun', 'sign_num': 1, 'degree': 5.0}}
+    res2 = calculate_varga(chart2, 7, 'odd_even_d7')
+    assert res2['sun']['sign'] == 'Sagittarius'
+
 def test_calculate_varga_boundary_high():
     # Extreme high boundary checks
     # 29.9999 should stay as is and calculate correctly
@@ -102,3 +113,20 @@ def test_floating_point_stability():
     res2 = calculate_varga(chart2, 3, 'same')
     assert res2['sun']['sign_num'] == 0 # Aries
     assert res2['sun']['degree'] > 29.9
+
+def test_all_vargas_cache_returns_independent_copies():
+    # Equal charts share cached vargas; edits to one result don't leak into the next
+    def chart(moon_degree):
+        return {
+            'ascendant': {'name': 'Ascendant', 'sign': 'Aries', 'sign_num': 0, 'degree': 5.0, 'abs_pos': 5.0},
+            'sun': {'name': 'Sun', 'sign': 'Leo', 'sign_num': 4, 'degree': 12.0, 'abs_pos': 132.0},
+            'moon': {'name': 'Moon', 'sign': 'Taurus', 'sign_num': 1, 'degree': moon_degree,
+                     'abs_pos': 30.0 + moon_degree},
+        }
+    first = calculate_all_vargas(chart(3.5))
+    first['d9_chart']['sun']['sign_num'] = -1
+    second = calculate_all_vargas(chart(3.5))
+    assert second['d9_chart']['sun']['sign_num'] == 3  # Leo (Fixed) starts Aries, 4th division -> Cancer
+    
+    moved = calculate_all_vargas(chart(20.0))
+    assert moved['d9_chart']['moon']['sign_num'] != second['d9_chart']['moon']['sign_num']
@@ -11,6 +11,20 @@ if PROJECT_ROOT not in sys.path:
 
 from backend.schemas import PlanetPosition, ChartResponse, ChartMetadata, ShadbalaData, VargaPlanet
 
+@pytest.fixture(autouse=True)
+def isolated_geocache(tmp_path, monkeypatch):
+    """Point the persistent geocoding cache at a per-test SQLite file."""
+    from backend import location
+    monkeypatch.setattr(location, "GEOCACHE_PATH", str(tmp_path / "geocache.sqlite3"))
+    monkeypatch.setattr(location, "_geocache_conn", None)
+    # Held here: tests may monkeypatch the module attribute itself
+    lookup = location._sync_geocoding_lookup
+    lookup.cache_clear()
+    yield
+    if location._geocache_conn is not None:
+        location._geocache_conn.close()
+    lookup.cache_clear()
+
 @pytest.fixture
 def chart_factory():
     """